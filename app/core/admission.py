@@ -0,0 +1,194 @@
+"""
+Admission control
+
+Bounds how many requests run at once (per worker, sized to the DB pool)
+and sheds the rest early. A request that cannot start within its class's
+queue deadline gets an immediate 503 with Retry-After instead of waiting
+on the pool until it times out.
+
+Classes, highest priority first:
+  critical - create_booking, process_payment; may use every slot
+  default  - everything not listed elsewhere
+  browse   - catalog reads; capped below the total so they never crowd out the others
+
+When a slot frees up it goes to the oldest waiter of the highest class that
+is allowed to start. Health, admin, exports and SSE streams are not admitted
+through here (they are cheap or long-lived by design).
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from app.core.config import settings
+
+# (method, path) -> class; paths without the trailing slash
+CRITICAL_ROUTES = {
+    ("POST", "/api/v2/bookings"),
+    ("POST", "/api/v2/payments"),
+}
+BROWSE_PREFIXES = ("/api/v2/destinations",)
+EXEMPT_PREFIXES = (
+    "/api/v1/health", "/api/v2/health", "/api/v2/admin", "/api/v2/exports",
+    "/docs", "/redoc", "/openapi.json",
+)
+EXEMPT_SUFFIXES = ("/availability/stream",)
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """Admission class for a request, or None if it bypasses admission control"""
+    path = path.rstrip("/") or "/"
+    if path.startswith(EXEMPT_PREFIXES) or path.endswith(EXEMPT_SUFFIXES):
+        return None
+    if (method, path) in CRITICAL_ROUTES:
+        return "critical"
+    if method in ("GET", "HEAD") and path.startswith(BROWSE_PREFIXES):
+        return "browse"
+    return "default"
+
+
+class AdmissionClass:
+    __slots__ = ("name", "limit", "queue_timeout", "max_queue", "in_flight", "waiters",
+                 "admitted", "queued", "rejected")
+
+    def __init__(self, name: str, limit: int, queue_timeout: float, max_queue: int):
+        self.name = name
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+
+
+class AdmissionController:
+    """Priority admission for one worker's event loop"""
+
+    def __init__(self, max_concurrency: int, classes):
+        self.max_concurrency = max_concurrency
+        # Dict order is priority order
+        self.classes: Dict[str, AdmissionClass] = {cls.name: cls for cls in classes}
+        self.in_flight = 0
+
+    @classmethod
+    def from_settings(cls) -> "AdmissionController":
+        total = settings.ADMISSION_MAX_CONCURRENCY
+        return cls(total, [
+            AdmissionClass("critical", total, settings.ADMISSION_CRITICAL_QUEUE_TIMEOUT_SECONDS,
+                           settings.ADMISSION_MAX_QUEUE),
+            AdmissionClass("default", total, settings.ADMISSION_DEFAULT_QUEUE_TIMEOUT_SECONDS,
+                           settings.ADMISSION_MAX_QUEUE),
+            AdmissionClass("browse", min(total, settings.ADMISSION_BROWSE_CONCURRENCY),
+                           settings.ADMISSION_BROWSE_QUEUE_TIMEOUT_SECONDS, settings.ADMISSION_MAX_QUEUE),
+        ])
+
+    def _can_start(self, cls: AdmissionClass) -> bool:
+        return self.in_flight < self.max_concurrency and cls.in_flight < cls.limit
+
+    def _start(self, cls: AdmissionClass):
+        self.in_flight += 1
+        cls.in_flight += 1
+        cls.admitted += 1
+
+    async def acquire(self, name: str) -> bool:
+        """Wait for a slot; False if the request should be shed"""
+        cls = self.classes[name]
+        if not cls.waiters and self._can_start(cls):
+            self._start(cls)
+            return True
+        if len(cls.waiters) >= cls.max_queue or cls.queue_timeout <= 0:
+            cls.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        cls.waiters.append(waiter)
+        cls.queued += 1
+        try:
+            await asyncio.wait((waiter,), timeout=cls.queue_timeout)
+        except asyncio.CancelledError:
+            # Client went away; hand the slot back if it was granted meanwhile
+            if not waiter.cancel():
+                self.release(name)
+            else:
+                cls.waiters.remove(waiter)
+            raise
+        if waiter.cancel():
+            cls.waiters.remove(waiter)
+            cls.rejected += 1
+            return False
+        return True
+
+    def release(self, name: str):
+        cls = self.classes[name]
+        self.in_flight -= 1
+        cls.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        for cls in self.classes.values():
+            while cls.waiters and self._can_start(cls):
+                self._start(cls)
+                cls.waiters.popleft().set_result(None)
+            if self.in_flight >= self.max_concurrency:
+                return
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "classes": {
+                cls.name: {
+                    "limit": cls.limit,
+                    "in_flight": cls.in_flight,
+                    "waiting": len(cls.waiters),
+                    "admitted": cls.admitted,
+                    "queued": cls.queued,
+                    "rejected": cls.rejected,
+                }
+                for cls in self.classes.values()
+            },
+        }
+
+
+admission_controller = AdmissionController.from_settings()
+
+
+class AdmissionMiddleware:
+    """Admit, queue or shed each request according to its class"""
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_CONTROL_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        name = classify(scope["method"], scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire(name):
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(name)
+
+    async def _reject(self, send):
+        body = json.dumps({"detail": "Server is busy, retry shortly"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -39,6 +39,73 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 100
     
+    # Serving (python -m app.serve)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WEB_CONCURRENCY: int = 4
+    SERVER_SHUTDOWN_TIMEOUT_SECONDS: float = 30.0
+    WORKER_RESTART_BACKOFF_SECONDS: float = 1.0  # Doubles per consecutive crash of the same worker
+    WORKER_RESTART_BACKOFF_MAX_SECONDS: float = 60.0
+    WORKER_MIN_UPTIME_SECONDS: float = 30.0  # Exiting sooner counts as a rapid failure
+    WORKER_MAX_RAPID_FAILURES: int = 5  # Consecutive rapid failures of one worker before giving up
+    
+    # Admission control (per worker; see app.core.admission)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 15  # Match the DB pool (pool_size + max_overflow)
+    ADMISSION_BROWSE_CONCURRENCY: int = 8  # Catalog reads never hold more slots than this
+    ADMISSION_MAX_QUEUE: int = 200  # Waiters per class; beyond this, shed immediately
+    ADMISSION_CRITICAL_QUEUE_TIMEOUT_SECONDS: float = 2.0  # create_booking, process_payment
+    ADMISSION_DEFAULT_QUEUE_TIMEOUT_SECONDS: float = 0.5
+    ADMISSION_BROWSE_QUEUE_TIMEOUT_SECONDS: float = 0.1
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    
+    # Catalog HTTP caching and response compression
+    CATALOG_CACHE_MAX_AGE_SECONDS: int = 5  # Short: responses carry live availability
+    CATALOG_CACHE_STALE_WHILE_REVALIDATE_SECONDS: int = 30
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Bytes; smaller responses are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5  # Used when the optional `brotli` package is installed
+    
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_QUEUE_SIZE: int = 10000  # Records beyond this are dropped, never block
+    LOG_SAMPLED_LOGGERS: str = "sqlalchemy.engine"  # Comma-separated; INFO/DEBUG sampled
+    LOG_SAMPLE_RATE: float = 0.01
+    
+    # Admin endpoints (profiling, exports) are disabled unless a token is set
+    ADMIN_TOKEN: Optional[str] = None
+    
+    # Profiling (opt-in; `X-Profile: <ADMIN_TOKEN>` forces it for one request)
+    PROFILING_SAMPLE_RATE: float = 0.0  # Adjustable at runtime: PUT /api/v2/admin/profiling
+    PROFILING_INTERVAL_MS: float = 5.0
+    
+    # Finance export
+    EXPORT_CHUNK_SIZE: int = 10000  # Rows per server-side cursor fetch / output chunk
+    
+    # Availability: live stream (SSE) and batch endpoint
+    AVAILABILITY_STREAM_MIN_INTERVAL_SECONDS: float = 0.5  # Coalescing window per client
+    AVAILABILITY_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    AVAILABILITY_BATCH_MAX_ITEMS: int = 200  # ids + codes per GET /destinations/availability
+    
+    # Multi-currency fares
+    SUPPORTED_CURRENCIES: str = "USD,EUR,GBP,JPY"
+    EXCHANGE_RATES_FILE: Optional[str] = None  # JSON {"EUR": 0.92, ...}; overrides the exchange_rates table
+    
+    # Background jobs
+    LOYALTY_ACCRUAL_CHUNK_SIZE: int = 1000
+    ENABLE_LIFECYCLE_SCHEDULER: bool = True
+    BOOKING_HOLD_MINUTES: int = 30  # Unpaid PENDING bookings release their seats after this
+    LIFECYCLE_INTERVAL_SECONDS: float = 30.0
+    LIFECYCLE_BATCH_SIZE: int = 500
+    LIFECYCLE_MAX_BATCHES_PER_TICK: int = 20
+    OUTBOX_RELAY_INTERVAL_SECONDS: float = 5.0  # Fallback poll; writers wake the relay
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_CLAIM_SECONDS: float = 300.0  # A claimed event is re-sent if its relay dies before settling it
+    OUTBOX_MAX_ATTEMPTS: int = 8  # Then dead-lettered (failed_at)
+    OUTBOX_RETRY_BASE_SECONDS: float = 30.0  # Doubles per attempt
+    OUTBOX_RETRY_MAX_SECONDS: float = 3600.0
+    
     class Config:
         env_file = ".env"
 
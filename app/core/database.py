@@ -7,8 +7,41 @@ from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
 DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-engine = create_async_engine(DATABASE_URL, echo=settings.DEBUG)
+# No echo: it writes synchronously from the event loop. Statement logging is
+# routed through the sampled queue pipeline instead (app.core.logging_config).
+engine = create_async_engine(DATABASE_URL)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+# Read path: same pool, but AUTOCOMMIT so reads never send BEGIN/COMMIT
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+ReadOnlySessionLocal = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+
+class ReleasingReadSession(AsyncSession):
+    """
+    Read session that hands its connection back to the pool after every
+    load. Async results are buffered and the loaded objects stay usable
+    once detached, so a route never holds a connection while its response
+    is serialized. Not for `stream()`.
+    """
+
+    async def execute(self, *args, **kwargs):
+        try:
+            return await super().execute(*args, **kwargs)
+        finally:
+            await self.close()
+
+    async def get(self, *args, **kwargs):
+        try:
+            return await super().get(*args, **kwargs)
+        finally:
+            await self.close()
+
+
+RequestReadSessionLocal = sessionmaker(
+    read_engine, class_=ReleasingReadSession, expire_on_commit=False, autoflush=False
+)
+
 Base = declarative_base()
 
 async def init_db():
@@ -23,3 +56,13 @@ async def get_db():
         except Exception:
             await session.rollback()
             raise
+
+async def get_read_db():
+    """
+    Session for GET routes. Never commits and holds no transaction.
+    
+    The connection is released after each query (ReleasingReadSession),
+    before the response is serialized, so routes need no cleanup of their own.
+    """
+    async with RequestReadSessionLocal() as session:
+        yield session
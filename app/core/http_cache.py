@@ -0,0 +1,90 @@
+"""
+HTTP caching for catalog reads
+ETag / Last-Modified validators derived from the shared catalog epochs
+
+Destination payloads change when the catalog changes (catalog_epoch) or
+when seats are booked or released (availability_epoch). Both epochs plus
+the time of the last change form a weak ETag, so a revalidation that
+matches is answered with 304 before any query runs or anything is
+serialized. Writers call `catalog_changed()` instead of bumping the
+epochs directly so Last-Modified moves with them.
+"""
+
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict
+
+from fastapi import HTTPException, Request, Response
+
+from app.core.config import settings
+from app.core.shared_state import shared_counters
+
+
+def catalog_changed(epoch: str = "catalog_epoch") -> int:
+    """Record a catalog (or, with epoch="availability_epoch", availability) change"""
+    # Time first: a reader that sees the new epoch also sees the new time
+    shared_counters.set_max("catalog_modified_at", int(time.time()))
+    return shared_counters.add(epoch)
+
+
+def catalog_validators() -> Dict[str, str]:
+    """
+    ETag always; Last-Modified only once the second of the last change has
+    passed. HTTP dates have one-second resolution, so a date handed out
+    during that second could also cover a later write in the same second,
+    and a date-based revalidation would then get a stale 304.
+    """
+    modified_at = shared_counters.get("catalog_modified_at")
+    catalog = shared_counters.get("catalog_epoch")
+    availability = shared_counters.get("availability_epoch")
+    validators = {
+        "ETag": f'W/"{modified_at:x}-{catalog}-{availability}"',
+        "Cache-Control": (
+            f"public, max-age={settings.CATALOG_CACHE_MAX_AGE_SECONDS}, "
+            f"stale-while-revalidate={settings.CATALOG_CACHE_STALE_WHILE_REVALIDATE_SECONDS}"
+        ),
+    }
+    if modified_at < int(time.time()):
+        validators["Last-Modified"] = formatdate(modified_at, usegmt=True)
+    return validators
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2): ignore W/ on both sides
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _not_modified_since(if_modified_since: str, last_modified: str) -> bool:
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def catalog_conditional_get(request: Request, response: Response):
+    """
+    Route dependency: attach validators and answer 304 if the client's copy is current.
+
+    Validators are read before the route queries, so a change racing the
+    query can only make the ETag older than the body (the client
+    refetches), never newer.
+    """
+    validators = catalog_validators()
+    response.headers.update(validators)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, validators["ETag"])
+    else:
+        # No Last-Modified (change still in the current second): dates cannot prove anything
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = (
+            bool(if_modified_since)
+            and "Last-Modified" in validators
+            and _not_modified_since(if_modified_since, validators["Last-Modified"])
+        )
+    if not_modified:
+        raise HTTPException(status_code=304, headers=validators)
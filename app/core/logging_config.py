@@ -0,0 +1,180 @@
+"""
+Logging configuration
+
+All log I/O goes through a bounded queue drained by a background thread
+(QueueListener). The request path pays for rendering the message (so
+arguments are never read from another thread) and an enqueue; JSON
+encoding, line formatting and writes happen on the listener thread.
+"""
+
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.config import settings
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_queue_handler: Optional["NonBlockingQueueHandler"] = None
+_output: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of INFO/DEBUG records from noisy loggers
+    (e.g. SQLAlchemy statement logging). Warnings and errors always pass.
+    """
+
+    def __init__(self, prefixes, rate: float):
+        super().__init__()
+        self.prefixes = tuple(prefixes)
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not record.name.startswith(self.prefixes):
+            return True
+        return random.random() < self.rate
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    Like the stock prepare(), the message (and any traceback) is rendered
+    in the calling thread: the arguments may be ORM instances the event
+    loop keeps mutating, so they must not be repr'd on the listener
+    thread. Unlike it, the line format is left to the listener, and the
+    request id is captured here (context vars don't cross threads). When
+    the queue is full the record is dropped and counted instead of
+    stalling the event loop.
+    """
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.request_id = request_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+
+class RequestIdMiddleware:
+    """Bind X-Request-ID (or a fresh id) to the request's log records and echo it back"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Route the root logger (and uvicorn's loggers) through the queue and
+    start the listener. Idempotent; after shutdown_logging() it restarts
+    the listener on the same queue, so every lifespan can call it.
+    """
+    global _queue_handler, _output, _listener
+    if _listener is not None:
+        return _listener
+
+    if _queue_handler is None:
+        _output = logging.StreamHandler(sys.stdout)
+        if settings.LOG_JSON:
+            _output.setFormatter(JsonFormatter())
+        else:
+            _output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+        _queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+        sampled = [name.strip() for name in settings.LOG_SAMPLED_LOGGERS.split(",") if name.strip()]
+        if sampled:
+            _queue_handler.addFilter(SamplingFilter(sampled, settings.LOG_SAMPLE_RATE))
+
+        root = logging.getLogger()
+        root.handlers = [_queue_handler]
+        root.setLevel(settings.LOG_LEVEL)
+
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+            uvicorn_logger = logging.getLogger(name)
+            uvicorn_logger.handlers = []
+            uvicorn_logger.propagate = True
+
+        # Replaces engine echo: statements are logged (sampled) through the queue
+        if settings.DEBUG:
+            logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, _output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread; setup_logging() starts it again"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
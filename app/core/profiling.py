@@ -0,0 +1,291 @@
+"""
+Request profiling (opt-in)
+
+A fraction of requests (PROFILING_SAMPLE_RATE, adjustable at runtime) or
+any request carrying `X-Profile: <ADMIN_TOKEN>` is profiled:
+
+- phases: dependencies, endpoint, pricing, db, serialization
+- stacks: a background thread samples the event loop thread's stack
+  every PROFILING_INTERVAL_MS while a profiled request is in flight
+
+Results are aggregated in memory and served by app.routers.admin as
+collapsed stacks (flamegraph.pl / speedscope input) or an SVG flame graph.
+Requests that are not sampled pay one random() call and a context
+variable lookup.
+
+The sample rate lives in the shared counters, so a change applies to
+every worker on the node. The aggregates do not: each worker profiles
+only the requests it serves and reports only those.
+"""
+
+import asyncio
+import contextvars
+import functools
+import hmac
+import html
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.shared_state import shared_counters
+
+_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("profile_timings", default=None)
+
+PHASES = ("dependencies", "endpoint", "pricing", "db", "serialization", "total")
+
+
+@contextmanager
+def profile_phase(name: str):
+    """Attribute the enclosed block to `name` when the request is being profiled"""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute that records when the endpoint starts and returns, for the phase breakdown"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint):
+            endpoint = _timed(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _timed(endpoint):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        timings = _timings.get()
+        if timings is None:
+            return await endpoint(*args, **kwargs)
+        timings["_endpoint_start"] = time.perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings["_endpoint_end"] = time.perf_counter()
+    return wrapper
+
+
+class RequestProfiler:
+    """Sampling decision, stack sampler thread and aggregates"""
+
+    def __init__(self):
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000
+        self._lock = threading.Lock()
+        self._stacks: Counter = Counter()
+        self._routes: Dict[str, Dict[str, Any]] = defaultdict(self._new_route_stats)
+        self._in_flight = 0
+        self._wake = threading.Event()
+        self._target_thread: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._sampler_pid: Optional[int] = None
+
+    @property
+    def sample_rate(self) -> float:
+        return shared_counters.get("profiling_sample_ppm") / 1_000_000
+
+    @sample_rate.setter
+    def sample_rate(self, rate: float):
+        shared_counters.set("profiling_sample_ppm", round(rate * 1_000_000))
+
+    @staticmethod
+    def _new_route_stats():
+        return {"count": 0, "phases": defaultdict(float), "recent_totals": deque(maxlen=500)}
+
+    # -- request hooks -------------------------------------------------
+
+    def should_sample(self, headers) -> bool:
+        token = settings.ADMIN_TOKEN
+        if token:
+            for name, value in headers:
+                # Bytes: compare_digest raises TypeError on non-ASCII str, and the header is client-controlled
+                if name == b"x-profile" and hmac.compare_digest(value, token.encode()):
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def begin(self):
+        self._ensure_sampler()
+        with self._lock:
+            self._in_flight += 1
+            self._target_thread = threading.get_ident()
+        self._wake.set()
+
+    def end(self, route: str, timings: Dict[str, float]):
+        with self._lock:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._wake.clear()
+            stats = self._routes[route]
+            stats["count"] += 1
+            for phase in PHASES:
+                stats["phases"][phase] += timings.get(phase, 0.0)
+            stats["recent_totals"].append(timings.get("total", 0.0))
+
+    # -- stack sampler -------------------------------------------------
+
+    def _ensure_sampler(self):
+        # Per process: a forked worker does not inherit the parent's thread
+        if self._sampler is None or self._sampler_pid != os.getpid() or not self._sampler.is_alive():
+            self._sampler_pid = os.getpid()
+            self._sampler = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+            self._sampler.start()
+
+    def _sample_loop(self):
+        while True:
+            self._wake.wait()
+            frame = sys._current_frames().get(self._target_thread)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                with self._lock:
+                    if self._in_flight:
+                        self._stacks[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    # -- reporting -----------------------------------------------------
+
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self._routes.clear()
+
+    def collapsed(self) -> str:
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = {}
+            for route, stats in self._routes.items():
+                count = stats["count"]
+                totals = sorted(stats["recent_totals"])
+                routes[route] = {
+                    "count": count,
+                    "mean_ms": {phase: round(stats["phases"][phase] / count * 1000, 3) for phase in PHASES},
+                    "p50_ms": round(totals[len(totals) // 2] * 1000, 3) if totals else None,
+                    "p99_ms": round(totals[min(len(totals) - 1, int(len(totals) * 0.99))] * 1000, 3) if totals else None,
+                }
+            return {
+                "worker_pid": os.getpid(),
+                "sample_rate": self.sample_rate,
+                "interval_ms": self.interval * 1000,
+                "stack_samples": sum(self._stacks.values()),
+                "routes": routes,
+            }
+
+    def flamegraph_svg(self, width: int = 1200, row_height: int = 16) -> str:
+        """Render the collapsed stacks as a self-contained SVG flame graph"""
+        with self._lock:
+            stacks = dict(self._stacks)
+        root = {"name": "all", "value": 0, "children": {}}
+        for stack, count in stacks.items():
+            root["value"] += count
+            node = root
+            for name in stack.split(";"):
+                node = node["children"].setdefault(name, {"name": name, "value": 0, "children": {}})
+                node["value"] += count
+
+        rects = []
+        depth_max = 0
+
+        def layout(node, x, depth):
+            nonlocal depth_max
+            depth_max = max(depth_max, depth)
+            w = node["value"] / root["value"] * width if root["value"] else width
+            rects.append((x, depth, w, node))
+            child_x = x
+            for child in sorted(node["children"].values(), key=lambda n: n["name"]):
+                layout(child, child_x, depth + 1)
+                child_x += child["value"] / root["value"] * width
+
+        layout(root, 0.0, 0)
+        height = (depth_max + 1) * row_height
+        parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">']
+        for x, depth, w, node in rects:
+            if w < 0.5:
+                continue
+            y = height - (depth + 1) * row_height
+            label = html.escape(node["name"])
+            hue = 20 + zlib.crc32(node["name"].encode()) % 40
+            parts.append(
+                f'<g><title>{label} ({node["value"]} samples)</title>'
+                f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" fill="hsl({hue},80%,60%)"/>'
+            )
+            if w > 40:
+                parts.append(f'<text x="{x + 3:.1f}" y="{y + row_height - 4}">{label[:int(w / 7)]}</text>')
+            parts.append("</g>")
+        parts.append("</svg>")
+        return "".join(parts)
+
+
+profiler = RequestProfiler()
+
+
+class ProfilingMiddleware:
+    """Profiles sampled requests; a pass-through for everything else"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not profiler.should_sample(scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, float] = {}
+        token = _timings.set(timings)
+        started = time.perf_counter()
+
+        async def send_timed(message):
+            if message["type"] == "http.response.start":
+                timings["_response_start"] = time.perf_counter()
+            await send(message)
+
+        profiler.begin()
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            _timings.reset(token)
+            timings["total"] = time.perf_counter() - started
+            if "_endpoint_start" in timings:
+                timings["dependencies"] = timings["_endpoint_start"] - started
+                timings["endpoint"] = timings["_endpoint_end"] - timings["_endpoint_start"]
+                if "_response_start" in timings:
+                    timings["serialization"] = timings["_response_start"] - timings["_endpoint_end"]
+            route = scope.get("route")
+            label = f"{scope['method']} {route.path if route is not None else scope['path']}"
+            profiler.end(label, timings)
+
+
+def instrument_engine(engine):
+    """Attribute time spent in DB statements to the `db` phase"""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _timings.get() is not None:
+            context._profile_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        timings = _timings.get()
+        started = getattr(context, "_profile_started", None)
+        if timings is not None and started is not None:
+            timings["db"] = timings.get("db", 0.0) + time.perf_counter() - started
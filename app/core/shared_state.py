@@ -0,0 +1,75 @@
+"""
+Shared-memory counters
+Hot counters and invalidation epochs shared by all workers on one node
+
+The segment is created when this module is first imported. Under
+`python -m app.serve` that happens in the parent before the workers are
+forked, so every worker maps the same memory. Under a plain
+`uvicorn app.main:app` it is process-local and everything still works.
+"""
+
+import ctypes
+import multiprocessing
+import time
+from typing import Dict, Iterable
+
+from app.core.config import settings
+
+COUNTERS = (
+    "catalog_epoch",       # Bumped on destination and exchange-rate writes (catalog caches, fare table)
+    "availability_epoch",  # Bumped on every availability change
+    "catalog_modified_at", # Unix time of the last catalog/availability change (Last-Modified)
+    "bookings_created",
+    "bookings_cancelled",
+    "profiling_sample_ppm",  # Profiler sample rate in parts per million, so PUT /admin/profiling reaches every worker
+)
+
+
+class SharedCounters:
+    """
+    Fixed set of int64 counters in an anonymous shared mapping.
+
+    Updates take a per-counter process-shared lock, so increments from
+    different workers are never lost. Reads are a single aligned 8-byte
+    load and take no lock.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names = tuple(names)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._values = multiprocessing.RawArray(ctypes.c_int64, len(self.names))
+        self._locks = [multiprocessing.Lock() for _ in self.names]
+        self.multiprocess = False  # Set by the launcher before forking workers
+
+    def get(self, name: str) -> int:
+        return self._values[self._index[name]]
+
+    def add(self, name: str, delta: int = 1) -> int:
+        """Atomically add `delta` and return the new value"""
+        i = self._index[name]
+        with self._locks[i]:
+            value = self._values[i] + delta
+            self._values[i] = value
+        return value
+
+    def set(self, name: str, value: int):
+        i = self._index[name]
+        with self._locks[i]:
+            self._values[i] = value
+
+    def set_max(self, name: str, value: int) -> int:
+        """Raise the counter to `value` unless it is already higher; return the result"""
+        i = self._index[name]
+        with self._locks[i]:
+            if value > self._values[i]:
+                self._values[i] = value
+            return self._values[i]
+
+    def snapshot(self) -> Dict[str, int]:
+        return {name: self._values[i] for name, i in self._index.items()}
+
+
+shared_counters = SharedCounters(COUNTERS)
+# Startup counts as a change: epochs restart at 0, so validators from a previous run never match
+shared_counters.set_max("catalog_modified_at", int(time.time()))
+shared_counters.set("profiling_sample_ppm", round(settings.PROFILING_SAMPLE_RATE * 1_000_000))
@@ -6,15 +6,48 @@ Version: 2.3.1
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
+import os
 
-from app.routers import bookings, destinations, users, payments
+from app.routers import bookings, destinations, users, payments, admin, exports
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, engine
+from app.core.admission import AdmissionMiddleware, admission_controller
+from app.core.compression import CompressionMiddleware
+from app.core.logging_config import setup_logging, shutdown_logging, RequestIdMiddleware
+from app.core.profiling import ProfilingMiddleware, instrument_engine
+from app.core.shared_state import shared_counters
+from app.services.availability import follow_other_workers
+from app.services.fares import fare_service
+from app.services.lifecycle import lifecycle_scheduler
+from app.services.notifications import outbox_relay
+
+setup_logging()  # Import-time records are queued too
+instrument_engine(engine)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    setup_logging()  # Restarts the listener if an earlier lifespan in this process stopped it
     await init_db()
+    await fare_service.table()
+    if settings.ENABLE_LIFECYCLE_SCHEDULER:
+        lifecycle_scheduler.start()
+    outbox_relay.start()
+    availability_sync = None
+    if shared_counters.multiprocess:
+        availability_sync = asyncio.create_task(
+            follow_other_workers(settings.AVAILABILITY_STREAM_MIN_INTERVAL_SECONDS)
+        )
     yield
+    if availability_sync is not None:
+        availability_sync.cancel()
+        try:
+            await availability_sync
+        except asyncio.CancelledError:
+            pass
+    await outbox_relay.stop()
+    await lifecycle_scheduler.stop()
+    shutdown_logging()
 
 app = FastAPI(
     title="SpacePort API",
@@ -23,6 +56,8 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Added first so it runs innermost: shed requests still get CORS and X-Request-ID headers
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # TODO: restrict in production (JIRA: SP-142 - marked as Done but not fixed)
@@ -30,12 +65,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestIdMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(CompressionMiddleware)
 
 # API v2 routes (Documentation still references v1)
 app.include_router(bookings.router, prefix="/api/v2/bookings", tags=["bookings"])
 app.include_router(destinations.router, prefix="/api/v2/destinations", tags=["destinations"])
 app.include_router(users.router, prefix="/api/v2/users", tags=["users"])
 app.include_router(payments.router, prefix="/api/v2/payments", tags=["payments"])
+app.include_router(admin.router, prefix="/api/v2/admin", tags=["admin"])
+app.include_router(exports.router, prefix="/api/v2/exports", tags=["exports"])
 
 # Legacy v1 endpoint - should be removed per SP-201
 @app.get("/api/v1/health")
@@ -50,3 +90,25 @@ async def health_check():
         "version": settings.API_VERSION,
         "environment": settings.ENVIRONMENT
     }
+
+
+@app.get("/api/v2/health/scheduler")
+async def scheduler_health():
+    """Booking lifecycle scheduler lag and throughput"""
+    return lifecycle_scheduler.metrics()
+
+
+@app.get("/api/v2/health/admission")
+async def admission_health():
+    """In-flight, queued and shed requests per priority class (this worker)"""
+    return admission_controller.metrics()
+
+
+@app.get("/api/v2/health/counters")
+async def counters_health():
+    """Node-wide counters shared by all workers"""
+    return {
+        "pid": os.getpid(),
+        "multiprocess": shared_counters.multiprocess,
+        "counters": shared_counters.snapshot()
+    }
@@ -3,7 +3,7 @@ Database Models
 Schema version: 3.0
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Enum, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Enum, Text, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -78,10 +78,22 @@ class Booking(Base):
     insurance_included = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    loyalty_points_awarded = Column(Integer)  # NULL until the loyalty accrual job has processed it
     # TODO: Add seat_class field (SP-203)
     
     user = relationship("User", back_populates="bookings")
     destination = relationship("Destination", back_populates="bookings")
+    
+    __table_args__ = (
+        # Loyalty accrual only scans completed bookings that are not accrued yet
+        Index(
+            "ix_bookings_loyalty_pending", "id",
+            postgresql_where=text("status = 'COMPLETED' AND loyalty_points_awarded IS NULL")
+        ),
+        # Lifecycle scheduler scans: stale PENDING holds, past CONFIRMED departures
+        Index("ix_bookings_status_created_at", "status", "created_at"),
+        Index("ix_bookings_status_departure_date", "status", "departure_date"),
+    )
 
 
 class WaitlistEntry(Base):
@@ -96,3 +108,55 @@ class WaitlistEntry(Base):
     priority_score = Column(Integer, default=0)
     notified = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class RefreshToken(Base):
+    """
+    One row per issued refresh token; only the SHA-256 of the token is stored.
+    Tokens from one login share a family_id: rotation adds to the family,
+    reuse of a rotated token revokes all of it.
+    """
+    __tablename__ = "refresh_tokens"
+    
+    token_hash = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    family_id = Column(String(32), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False)
+    rotated_at = Column(DateTime)  # Set when exchanged; presenting it again is reuse
+    revoked_at = Column(DateTime)
+
+
+class JobCheckpoint(Base):
+    """Durable keyset position for background jobs"""
+    __tablename__ = "job_checkpoints"
+    
+    name = Column(String(100), primary_key=True)
+    position = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ExchangeRate(Base):
+    """Units of `currency` per USD; read into the in-memory fare table"""
+    __tablename__ = "exchange_rates"
+    
+    currency = Column(String(3), primary_key=True)
+    units_per_usd = Column(Float, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class OutboxEvent(Base):
+    """Transactional outbox: side effects committed with the write that caused them"""
+    __tablename__ = "outbox"
+    
+    id = Column(Integer, primary_key=True)
+    topic = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime, default=datetime.utcnow)
+    published_at = Column(DateTime)  # NULL until delivered by the relay
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime)  # Claim lease, then retry backoff; NULL = due now
+    failed_at = Column(DateTime)  # Dead-lettered after OUTBOX_MAX_ATTEMPTS; never retried
+    
+    __table_args__ = (
+        Index("ix_outbox_pending", "id", postgresql_where=text("published_at IS NULL AND failed_at IS NULL")),
+    )
@@ -0,0 +1,113 @@
+"""
+Admin API Router
+Runtime profiling controls (see app.core.profiling) and exchange rates
+
+Disabled (404) unless ADMIN_TOKEN is set; every call must
+send it as `X-Admin-Token`.
+
+Profiling data is per worker: under `python -m app.serve` each call is
+answered by whichever worker accepted the connection, and summaries,
+stacks and resets cover that worker's requests only. Only the sample
+rate is node-wide.
+"""
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Body
+from fastapi.responses import PlainTextResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
+import hmac
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.profiling import profiler
+from app.core.http_cache import catalog_changed
+from app.models.models import ExchangeRate
+from app.services.fares import fare_service
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    token = settings.ADMIN_TOKEN
+    if not token:
+        raise HTTPException(status_code=404, detail="Not found")
+    # Compare the raw header bytes: compare_digest raises TypeError on non-ASCII str
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode("latin-1"), token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/profiling", dependencies=[Depends(require_admin)])
+async def get_profiling_summary():
+    """Sample rate and this worker's per-route phase breakdown (mean, p50, p99)"""
+    return profiler.summary()
+
+
+@router.put("/profiling", dependencies=[Depends(require_admin)])
+async def update_profiling(sample_rate: float = Query(ge=0, le=1)):
+    """Change the sampled fraction of requests on every worker; takes effect immediately"""
+    profiler.sample_rate = sample_rate
+    return profiler.summary()
+
+
+@router.delete("/profiling", dependencies=[Depends(require_admin)])
+async def reset_profiling():
+    """Clear this worker's profiling data"""
+    profiler.reset()
+    return {"message": "Profiling data cleared"}
+
+
+@router.get("/profiling/stacks", dependencies=[Depends(require_admin)])
+async def download_collapsed_stacks():
+    """This worker's collapsed stacks (flamegraph.pl / speedscope format)"""
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={"Content-Disposition": 'attachment; filename="spaceport-stacks.txt"'}
+    )
+
+
+@router.get("/profiling/flamegraph.svg", dependencies=[Depends(require_admin)])
+async def download_flamegraph():
+    """This worker's stacks as an SVG flame graph"""
+    return Response(
+        profiler.flamegraph_svg(),
+        media_type="image/svg+xml",
+        headers={"Content-Disposition": 'attachment; filename="spaceport-flamegraph.svg"'}
+    )
+
+
+@router.get("/exchange-rates", dependencies=[Depends(require_admin)])
+async def get_exchange_rates():
+    """Rates the fare table was built from (units per USD)"""
+    table = await fare_service.table()
+    return {"epoch": table.epoch, "rates": table.rates}
+
+
+@router.put("/exchange-rates", dependencies=[Depends(require_admin)])
+async def update_exchange_rates(
+    rates: Dict[str, float] = Body(...),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upsert rates and rebuild the fare table.
+    Ignored while EXCHANGE_RATES_FILE is set (the file wins); edit it and POST /exchange-rates/reload.
+    """
+    if settings.EXCHANGE_RATES_FILE:
+        raise HTTPException(status_code=409, detail="Exchange rates are loaded from EXCHANGE_RATES_FILE")
+    supported = fare_service.supported_currencies
+    for currency, units_per_usd in rates.items():
+        if currency.upper() not in supported:
+            raise HTTPException(status_code=400, detail=f"Unsupported currency: {currency}")
+        if units_per_usd <= 0:
+            raise HTTPException(status_code=400, detail=f"Invalid rate: {currency}={units_per_usd}")
+    for currency, units_per_usd in rates.items():
+        await db.merge(ExchangeRate(currency=currency.upper(), units_per_usd=units_per_usd))
+    await db.commit()
+    catalog_changed()
+    return await get_exchange_rates()
+
+
+@router.post("/exchange-rates/reload", dependencies=[Depends(require_admin)])
+async def reload_exchange_rates():
+    """Rebuild the fare table on every worker (after editing EXCHANGE_RATES_FILE)"""
+    catalog_changed()
+    return await get_exchange_rates()
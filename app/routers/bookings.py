@@ -5,17 +5,21 @@ Handles all booking-related operations
 
 from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, or_
 from datetime import datetime
+import json
 import uuid
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.config import settings
-from app.models.models import Booking, BookingStatus, Destination
+from app.core.profiling import ProfiledRoute, profile_phase
+from app.models.models import Booking, BookingStatus, Destination, OutboxEvent
 from app.services.pricing import PricingService
-from app.services.notifications import send_booking_confirmation
+from app.services.notifications import outbox_relay
+from app.services.availability import notify_availability_change
+from app.core.shared_state import shared_counters
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/")
@@ -44,20 +48,37 @@ async def create_booking(
             detail=f"Maximum {settings.MAX_PASSENGERS_PER_BOOKING} passengers allowed"
         )
     
-    destination = await db.get(Destination, destination_id)
-    if not destination:
-        raise HTTPException(status_code=404, detail="Destination not found")
-    
-    if destination.current_availability and destination.current_availability < passenger_count:
+    # Check and decrement inventory in one statement. NULL availability means
+    # the destination is not capacity-tracked.
+    result = await db.execute(
+        update(Destination)
+        .where(
+            Destination.id == destination_id,
+            or_(
+                Destination.current_availability.is_(None),
+                Destination.current_availability >= passenger_count
+            )
+        )
+        .values(current_availability=Destination.current_availability - passenger_count)
+        .returning(Destination.base_price_usd, Destination.current_availability)
+        .execution_options(synchronize_session=False)
+    )
+    reserved = result.one_or_none()
+    if reserved is None:
+        # Slow path only: tell "missing" apart from "sold out"
+        exists = await db.scalar(select(Destination.id).where(Destination.id == destination_id))
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Destination not found")
         raise HTTPException(status_code=400, detail="Not enough availability")
     
-    pricing_service = PricingService()
-    price_breakdown = pricing_service.calculate_total(
-        base_price=destination.base_price_usd,
-        passenger_count=passenger_count,
-        departure_date=departure_date,
-        discount_code=discount_code
-    )
+    with profile_phase("pricing"):
+        pricing_service = PricingService()
+        price_breakdown = pricing_service.calculate_total(
+            base_price=reserved.base_price_usd,
+            passenger_count=passenger_count,
+            departure_date=departure_date,
+            discount_code=discount_code
+        )
     
     reference_code = f"SP-{uuid.uuid4().hex[:8].upper()}"
     
@@ -74,24 +95,28 @@ async def create_booking(
         status=BookingStatus.PENDING,
         special_requests=special_requests
     )
-    
     db.add(booking)
-    await db.commit()
-    await db.refresh(booking)
     
-    if destination.current_availability:
-        destination.current_availability -= passenger_count
-        await db.commit()
+    # Confirmation goes through the outbox (SP-211): it commits with the
+    # booking and is delivered by the relay, never lost or sent for a rollback
+    db.add(OutboxEvent(
+        topic="booking.created",
+        payload=json.dumps({"reference_code": reference_code, "user_id": user_id})
+    ))
     
-    # Send confirmation (async, fire-and-forget)
-    # BUG: This should await, notifications sometimes not sent (SP-211)
-    send_booking_confirmation(booking.id)
+    # Single transaction: UPDATE ... RETURNING, INSERT booking ... RETURNING, INSERT outbox
+    await db.commit()
+    
+    if reserved.current_availability is not None:
+        notify_availability_change(destination_id, reserved.current_availability)
+    shared_counters.add("bookings_created")
+    outbox_relay.wake()
     
     return booking
 
 
 @router.get("/{booking_id}")
-async def get_booking(booking_id: int, db: AsyncSession = Depends(get_db)):
+async def get_booking(booking_id: int, db: AsyncSession = Depends(get_read_db)):
     booking = await db.get(Booking, booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
@@ -133,12 +158,24 @@ async def cancel_booking(booking_id: int, db: AsyncSession = Depends(get_db)):
     - 15-30 days: 50% refund
     - Less than 15 days: No refund
     """
-    booking = await db.get(Booking, booking_id)
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-    
-    if booking.status == BookingStatus.CANCELLED:
-        raise HTTPException(status_code=400, detail="Booking already cancelled")
+    # Claim the cancellation in one statement: of two concurrent cancels
+    # (or a cancel racing hold expiry) exactly one matches. Completed and
+    # refunded bookings have no seats to give back and are not cancellable.
+    result = await db.execute(
+        update(Booking)
+        .where(Booking.id == booking_id, Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]))
+        .values(status=BookingStatus.CANCELLED, updated_at=datetime.utcnow())
+        .returning(Booking.destination_id, Booking.passenger_count, Booking.total_price, Booking.departure_date)
+        .execution_options(synchronize_session=False)
+    )
+    booking = result.one_or_none()
+    if booking is None:
+        status = await db.scalar(select(Booking.status).where(Booking.id == booking_id))
+        if status is None:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        if status == BookingStatus.CANCELLED:
+            raise HTTPException(status_code=400, detail="Booking already cancelled")
+        raise HTTPException(status_code=400, detail=f"Cannot cancel a {status.value} booking")
     
     days_until_departure = (booking.departure_date - datetime.utcnow()).days
     
@@ -151,14 +188,20 @@ async def cancel_booking(booking_id: int, db: AsyncSession = Depends(get_db)):
     
     refund_amount = booking.total_price * (refund_percent / 100)
     
-    booking.status = BookingStatus.CANCELLED
-    booking.updated_at = datetime.utcnow()
-    
-    destination = await db.get(Destination, booking.destination_id)
-    if destination.current_availability is not None:
-        destination.current_availability += booking.passenger_count
+    # Relative increment, never read-modify-write: concurrent releases must not overwrite each other
+    released = await db.execute(
+        update(Destination)
+        .where(Destination.id == booking.destination_id, Destination.current_availability.isnot(None))
+        .values(current_availability=Destination.current_availability + booking.passenger_count)
+        .returning(Destination.current_availability)
+        .execution_options(synchronize_session=False)
+    )
+    current_availability = released.scalar_one_or_none()
     
     await db.commit()
+    if current_availability is not None:
+        notify_availability_change(booking.destination_id, current_availability)
+    shared_counters.add("bookings_cancelled")
     
     return {
         "message": "Booking cancelled successfully",
@@ -169,10 +212,11 @@ async def cancel_booking(booking_id: int, db: AsyncSession = Depends(get_db)):
 
 # Legacy endpoint - should be removed per SP-201
 @router.get("/legacy/search")
-async def legacy_search_bookings(email: str, db: AsyncSession = Depends(get_db)):
+async def legacy_search_bookings(email: str, db: AsyncSession = Depends(get_read_db)):
     """DEPRECATED: Use /api/v2/users/{user_id}/bookings instead."""
     from app.models.models import User
     result = await db.execute(
         select(Booking).join(User).where(User.email == email)
     )
-    return result.scalars().all()
+    bookings = result.scalars().all()
+    return bookings
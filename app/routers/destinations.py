@@ -4,27 +4,48 @@ Manages space travel destinations
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, or_
+from datetime import datetime
 from typing import List, Optional
+import asyncio
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db, ReadOnlySessionLocal
 from app.core.config import settings
+from app.core.profiling import ProfiledRoute
 from app.models.models import Destination
+from app.core.http_cache import catalog_changed, catalog_conditional_get
+from app.services.availability import availability_hub, format_availability_event
+from app.services.fares import fare_service
+from app.services.pricing import PricingService
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+pricing_service = PricingService()
 
 
-@router.get("/")
+async def _fare_table(currency: str):
+    table = await fare_service.table()
+    if currency not in table.rates:
+        raise HTTPException(status_code=400, detail=f"Unsupported currency: {currency}")
+    return table
+
+
+@router.get("/", dependencies=[Depends(catalog_conditional_get)])
 async def list_destinations(
     active_only: bool = Query(default=True),
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     max_risk_level: Optional[int] = Query(default=None, ge=1, le=5),
-    db: AsyncSession = Depends(get_db)
+    currency: Optional[str] = Query(default=None, min_length=3, max_length=3),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List all available destinations with optional filters.
+    Supports conditional GET (ETag / Last-Modified, see app.core.http_cache).
+    
+    With `currency`, each destination also carries `base_price` in that
+    currency (from the precomputed fare table).
     
     Risk levels (not documented in API spec):
     1 - Minimal risk (orbital)
@@ -48,19 +69,91 @@ async def list_destinations(
         query = query.where(Destination.risk_level <= max_risk_level)
     
     result = await db.execute(query)
-    return result.scalars().all()
+    destinations = result.scalars().all()
+    if not currency:
+        return destinations
+    
+    currency = currency.upper()
+    prices = (await _fare_table(currency)).prices[currency]
+    return [
+        {
+            **{column.name: getattr(destination, column.name) for column in Destination.__table__.columns},
+            "base_price": prices.get(destination.id),
+            "currency": currency,
+        }
+        for destination in destinations
+    ]
+
+
+def _availability(destination, passenger_count: int) -> dict:
+    available = (destination.current_availability or 0) >= passenger_count
+    
+    response = {
+        "destination_id": destination.id,
+        "destination_code": destination.code,
+        "requested_passengers": passenger_count,
+        "available": available,
+        "current_availability": destination.current_availability,
+        "max_capacity": destination.max_capacity
+    }
+    
+    if not available:
+        response["waitlist_available"] = settings.ENABLE_WAITLIST
+    
+    return response
+
+
+# Declared before /{destination_id} so "availability" is not taken for an id
+@router.get("/availability", dependencies=[Depends(catalog_conditional_get)])
+async def check_availability_batch(
+    destination_id: List[int] = Query(default=[]),
+    code: List[str] = Query(default=[]),
+    passenger_count: int = Query(default=1, ge=1, le=10),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Availability for many destinations in one request and one query
+    (e.g. ?destination_id=1&destination_id=2&code=MARS-01&passenger_count=2).
+    
+    Results follow the request order; unknown ids/codes are listed in `not_found`.
+    """
+    codes = [c.upper() for c in code]
+    if not destination_id and not codes:
+        raise HTTPException(status_code=400, detail="Pass at least one destination_id or code")
+    if len(destination_id) + len(codes) > settings.AVAILABILITY_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.AVAILABILITY_BATCH_MAX_ITEMS} destinations per request"
+        )
+    
+    result = await db.execute(
+        select(Destination.id, Destination.code, Destination.current_availability, Destination.max_capacity)
+        .where(or_(Destination.id.in_(destination_id), Destination.code.in_(codes)))
+    )
+    rows = result.all()
+    by_id = {row.id: row for row in rows}
+    by_code = {row.code: row for row in rows}
+    
+    destinations, not_found, seen = [], [], set()
+    for key, row in [(i, by_id.get(i)) for i in destination_id] + [(c, by_code.get(c)) for c in codes]:
+        if row is None:
+            not_found.append(key)
+        elif row.id not in seen:
+            seen.add(row.id)
+            destinations.append(_availability(row, passenger_count))
+    return {"destinations": destinations, "not_found": not_found}
 
 
-@router.get("/{destination_id}")
-async def get_destination(destination_id: int, db: AsyncSession = Depends(get_db)):
+@router.get("/{destination_id}", dependencies=[Depends(catalog_conditional_get)])
+async def get_destination(destination_id: int, db: AsyncSession = Depends(get_read_db)):
     destination = await db.get(Destination, destination_id)
     if not destination:
         raise HTTPException(status_code=404, detail="Destination not found")
     return destination
 
 
-@router.get("/code/{code}")
-async def get_destination_by_code(code: str, db: AsyncSession = Depends(get_db)):
+@router.get("/code/{code}", dependencies=[Depends(catalog_conditional_get)])
+async def get_destination_by_code(code: str, db: AsyncSession = Depends(get_read_db)):
     """
     Get destination by unique code (e.g., MARS-01).
     Undocumented endpoint - added for mobile app in v2.2
@@ -78,7 +171,7 @@ async def get_destination_by_code(code: str, db: AsyncSession = Depends(get_db))
 async def check_availability(
     destination_id: int,
     passenger_count: int = Query(ge=1, le=10),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Check if destination has availability.
@@ -89,21 +182,76 @@ async def check_availability(
     if not destination:
         raise HTTPException(status_code=404, detail="Destination not found")
     
-    available = (destination.current_availability or 0) >= passenger_count
+    return _availability(destination, passenger_count)
+
+
+@router.get("/{destination_id}/quote")
+async def quote_fare(
+    destination_id: int,
+    departure_date: datetime,
+    passenger_count: int = Query(default=1, ge=1, le=10),
+    currency: str = Query(default="USD", min_length=3, max_length=3),
+    discount_code: Optional[str] = None
+):
+    """
+    Price a trip in any supported currency without booking it.
+    Served from the in-memory fare table; loyalty discounts are applied at booking.
+    """
+    currency = currency.upper()
+    table = await _fare_table(currency)
+    base_price = table.price(destination_id, currency)
+    if base_price is None:
+        raise HTTPException(status_code=404, detail="Destination not found")
     
-    response = {
-        "destination_id": destination_id,
-        "destination_code": destination.code,
-        "requested_passengers": passenger_count,
-        "available": available,
-        "current_availability": destination.current_availability,
-        "max_capacity": destination.max_capacity
-    }
+    quote = pricing_service.calculate_total(
+        base_price=base_price,
+        passenger_count=passenger_count,
+        departure_date=departure_date,
+        discount_code=discount_code,
+        currency=currency,
+        fx_rate=table.rates[currency]
+    )
+    return {"destination_id": destination_id, "base_price": base_price, **quote}
+
+
+@router.get("/{destination_id}/availability/stream")
+async def stream_availability(destination_id: int):
+    """
+    Live `current_availability` for a destination (Server-Sent Events).
+    Replaces polling /availability from the booking UI.
     
-    if not available:
-        response["waitlist_available"] = settings.ENABLE_WAITLIST
+    The first event is the current value; later events are pushed on
+    booking/cancel, coalesced to at most one per
+    AVAILABILITY_STREAM_MIN_INTERVAL_SECONDS per client.
+    """
+    # Subscribe before reading so no change between the read and the stream is lost
+    subscription = availability_hub.subscribe(destination_id)
     
-    return response
+    # Not Depends(get_db): the stream stays open for minutes and must not pin a pool connection
+    async with ReadOnlySessionLocal() as db:
+        destination = await db.get(Destination, destination_id)
+    if not destination:
+        subscription.close()
+        raise HTTPException(status_code=404, detail="Destination not found")
+    
+    async def events():
+        try:
+            yield format_availability_event(destination_id, destination.current_availability)
+            while True:
+                frame = await subscription.wait(settings.AVAILABILITY_STREAM_HEARTBEAT_SECONDS)
+                if frame is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield frame
+                await asyncio.sleep(settings.AVAILABILITY_STREAM_MIN_INTERVAL_SECONDS)
+        finally:
+            subscription.close()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # Admin endpoint - should require authentication (SP-188 - Open)
@@ -132,4 +280,5 @@ async def create_destination(
     db.add(destination)
     await db.commit()
     await db.refresh(destination)
+    catalog_changed()
     return destination
@@ -0,0 +1,176 @@
+"""
+Exports API Router
+Bulk data exports for finance (reconciliation of totals, discounts, refunds)
+
+Rows are read through a server-side cursor and written out in chunks of
+EXPORT_CHUNK_SIZE. Memory stays flat however large the date range is.
+Requires `X-Admin-Token` (see app.routers.admin).
+"""
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from datetime import datetime
+from typing import List, Optional
+import csv
+import io
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.models import Booking, Destination, User
+from app.routers.admin import require_admin
+
+router = APIRouter()
+
+EXPORT_COLUMNS = (
+    ("booking_id", Booking.id),
+    ("reference_code", Booking.reference_code),
+    ("created_at", Booking.created_at),
+    ("departure_date", Booking.departure_date),
+    ("status", Booking.status),
+    ("user_id", Booking.user_id),
+    ("user_email", User.email),
+    ("destination_id", Booking.destination_id),
+    ("destination_code", Destination.code),
+    ("passenger_count", Booking.passenger_count),
+    ("total_price", Booking.total_price),
+    ("discount_applied", Booking.discount_applied),
+    ("discount_code", Booking.discount_code),
+)
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _export_query(start: Optional[datetime], end: Optional[datetime], destination_ids: Optional[List[int]]):
+    query = (
+        select(*[column for _, column in EXPORT_COLUMNS])
+        .join(User, Booking.user_id == User.id)
+        .join(Destination, Booking.destination_id == Destination.id)
+        .order_by(Booking.id)
+    )
+    if start:
+        query = query.where(Booking.created_at >= start)
+    if end:
+        query = query.where(Booking.created_at < end)
+    if destination_ids:
+        query = query.where(Booking.destination_id.in_(destination_ids))
+    return query
+
+
+async def _partitions(query):
+    """Yield lists of rows from a server-side cursor; the session lives as long as the stream"""
+    # Plain (non-AUTOCOMMIT) session: server-side cursors need a transaction.
+    # Nothing is written, so it is never committed.
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=settings.EXPORT_CHUNK_SIZE))
+        async for partition in result.partitions():
+            yield partition
+
+
+def _plain(value):
+    return value.value if hasattr(value, "value") else value
+
+
+async def _csv_chunks(query):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    async for rows in _partitions(query):
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink:
+    """Write-only file object collecting what the Arrow/Parquet writer emits"""
+
+    def __init__(self):
+        self.parts = []
+        self.closed = False
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def _arrow_schema(pa):
+    types = {
+        "created_at": pa.timestamp("us"), "departure_date": pa.timestamp("us"),
+        "total_price": pa.float64(), "discount_applied": pa.float64(),
+        "booking_id": pa.int64(), "user_id": pa.int64(), "destination_id": pa.int64(),
+        "passenger_count": pa.int32(),
+    }
+    return pa.schema([(name, types.get(name, pa.string())) for name, _ in EXPORT_COLUMNS])
+
+
+async def _columnar_chunks(query, fmt: str):
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    schema = _arrow_schema(pa)
+    sink = _ChunkSink()
+    output = pa.PythonFile(sink, mode="w")
+    if fmt == "arrow":
+        writer = pa.ipc.new_stream(output, schema)
+    else:
+        writer = pa.parquet.ParquetWriter(output, schema, compression="zstd")
+    status_index = schema.get_field_index("status")
+
+    async for rows in _partitions(query):
+        columns = list(zip(*rows))
+        columns[status_index] = [_plain(value) for value in columns[status_index]]
+        writer.write_batch(pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema
+        ))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+@router.get("/bookings", dependencies=[Depends(require_admin)])
+async def export_bookings(
+    format: str = Query(default="csv", pattern="^(csv|arrow|parquet)$"),
+    start: Optional[datetime] = Query(default=None, description="created_at >= start"),
+    end: Optional[datetime] = Query(default=None, description="created_at < end"),
+    destination_id: Optional[List[int]] = Query(default=None),
+):
+    """
+    Stream bookings joined with user email and destination code.
+
+    Formats: csv, arrow (Arrow IPC stream), parquet (zstd).
+    Arrow and Parquet need pyarrow installed on the server.
+    """
+    if format != "csv":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail=f"{format} export requires pyarrow")
+
+    query = _export_query(start, end, destination_id)
+    chunks = _csv_chunks(query) if format == "csv" else _columnar_chunks(query, format)
+    filename = f"bookings-{(start or datetime.min).date()}-{(end or datetime.utcnow()).date()}.{format}"
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -4,13 +4,16 @@ Payments API Router
 
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
 from datetime import datetime
 import uuid
 
 from app.core.database import get_db
 from app.core.config import settings
+from app.core.profiling import ProfiledRoute
+from app.models.models import Booking, BookingStatus
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 SUPPORTED_METHODS = ["credit_card", "debit_card", "bank_transfer"]
 
@@ -29,10 +32,28 @@ async def process_payment(
     """
     Process payment for booking.
     Supported methods: credit_card, debit_card, bank_transfer
+    
+    Confirms the booking (PENDING -> CONFIRMED), so the lifecycle
+    scheduler no longer treats it as an unpaid hold.
     """
     if payment_method not in SUPPORTED_METHODS:
         raise HTTPException(status_code=400, detail="Unsupported payment method")
     
+    # Conditional transition: a payment racing hold expiry (or a second
+    # payment) matches nothing instead of confirming a released booking
+    result = await db.execute(
+        update(Booking)
+        .where(Booking.id == booking_id, Booking.status == BookingStatus.PENDING)
+        .values(status=BookingStatus.CONFIRMED, updated_at=datetime.utcnow())
+        .returning(Booking.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is None:
+        exists = await db.scalar(select(Booking.id).where(Booking.id == booking_id))
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        raise HTTPException(status_code=400, detail="Booking is not awaiting payment")
+    
     final_amount = amount
     
     # Crypto discount (internal promotion, not public)
@@ -40,6 +61,7 @@ async def process_payment(
         final_amount = amount * 0.95  # 5% discount
     
     transaction_id = f"TXN-{uuid.uuid4().hex[:12].upper()}"
+    await db.commit()  # Before responding: the booking must be CONFIRMED once the client sees success
     
     return {
         "transaction_id": transaction_id,
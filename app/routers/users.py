@@ -3,18 +3,26 @@ Users API Router
 User management and authentication
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Header, Body
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.orm import joinedload
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
 import hashlib
+import logging
+import secrets
+import uuid
 import jwt
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.config import settings
-from app.models.models import User
+from app.core.profiling import ProfiledRoute
+from app.models.models import User, Booking, BookingStatus, RefreshToken
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=ProfiledRoute)
 
 
 def hash_password(password: str) -> str:
@@ -37,6 +45,56 @@ def create_access_token(user_id: int) -> str:
     return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
 
 
+def hash_refresh_token(token: str) -> str:
+    # Tokens are 256 random bits, so a plain SHA-256 is enough (no salt or slow KDF)
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_refresh_token(
+    db: AsyncSession,
+    user_id: int,
+    family_id: Optional[str] = None,
+    expires_at: Optional[datetime] = None
+) -> Tuple[str, datetime]:
+    """
+    Add a new refresh token to the session (the caller commits).
+    Returns the plaintext token (only its hash is stored) and its expiry.
+    
+    Rotations pass the family's `expires_at` on, so a login expires
+    REFRESH_TOKEN_EXPIRE_DAYS after the password was checked, however often
+    it is refreshed.
+    """
+    token = secrets.token_urlsafe(32)
+    expires_at = expires_at or datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    db.add(RefreshToken(
+        token_hash=hash_refresh_token(token),
+        user_id=user_id,
+        family_id=family_id or uuid.uuid4().hex,
+        expires_at=expires_at
+    ))
+    return token, expires_at
+
+
+def _token_response(user_id: int, refresh_token: str, refresh_expires_at: datetime) -> dict:
+    return {
+        "access_token": create_access_token(user_id),
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "refresh_token": refresh_token,
+        "refresh_expires_in": max(0, int((refresh_expires_at - datetime.utcnow()).total_seconds()))
+    }
+
+
+async def _revoke(db: AsyncSession, condition, now: datetime) -> int:
+    result = await db.execute(
+        update(RefreshToken)
+        .where(condition, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
 @router.post("/register")
 async def register_user(
     email: str,
@@ -83,19 +141,85 @@ async def login(email: str, password: str, db: AsyncSession = Depends(get_db)):
     if not user.is_active:
         raise HTTPException(status_code=401, detail="Account deactivated")
     
-    access_token = create_access_token(user.id)
+    refresh_token, refresh_expires_at = issue_refresh_token(db, user.id)
+    await db.commit()  # Before responding: the client may refresh right away
     
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    }
+    return _token_response(user.id, refresh_token, refresh_expires_at)
+
+
+@router.post("/token/refresh")
+async def refresh_access_token(
+    refresh_token: str = Body(..., embed=True),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+    
+    The presented token is single-use. Presenting it again (a stolen or
+    replayed token) revokes every token from the same login. Deactivated
+    accounts cannot refresh, and a login's tokens all expire
+    REFRESH_TOKEN_EXPIRE_DAYS after the login itself.
+    """
+    now = datetime.utcnow()
+    token_hash = hash_refresh_token(refresh_token)
+    
+    # Happy path: one indexed UPDATE claims the token (the is_active check is
+    # a primary-key probe inside it), one INSERT replaces it
+    user_is_active = (
+        select(User.id)
+        .where(User.id == RefreshToken.user_id, User.is_active.is_(True))
+        .exists()
+    )
+    result = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.rotated_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+            user_is_active
+        )
+        .values(rotated_at=now)
+        .returning(RefreshToken.user_id, RefreshToken.family_id, RefreshToken.expires_at)
+        .execution_options(synchronize_session=False)
+    )
+    claimed = result.one_or_none()
+    if claimed is not None:
+        new_token, _ = issue_refresh_token(db, claimed.user_id, claimed.family_id, claimed.expires_at)
+        await db.commit()
+        return _token_response(claimed.user_id, new_token, claimed.expires_at)
+    
+    token = await db.get(RefreshToken, token_hash)
+    if token is not None and token.rotated_at is not None and token.revoked_at is None:
+        revoked = await _revoke(db, RefreshToken.family_id == token.family_id, now)
+        await db.commit()
+        logger.warning("Refresh token reuse for user %s; revoked %d tokens", token.user_id, revoked)
+    raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+
+@router.post("/token/revoke")
+async def revoke_refresh_tokens(
+    refresh_token: str = Body(..., embed=True),
+    all_sessions: bool = Body(default=False, embed=True),
+    db: AsyncSession = Depends(get_db)
+):
+    """Log out: revoke this login's tokens, or with all_sessions every token the user holds"""
+    token = await db.get(RefreshToken, hash_refresh_token(refresh_token))
+    if token is None or token.revoked_at is not None:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    
+    if all_sessions:
+        revoked = await _revoke(db, RefreshToken.user_id == token.user_id, datetime.utcnow())
+    else:
+        revoked = await _revoke(db, RefreshToken.family_id == token.family_id, datetime.utcnow())
+    await db.commit()
+    return {"revoked": revoked}
 
 
 @router.get("/me")
 async def get_current_user(
     authorization: str = Header(...),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get current authenticated user's profile"""
     try:
@@ -113,9 +237,40 @@ async def get_current_user(
 
 
 @router.get("/{user_id}")
-async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get user by ID"""
     user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
+
+
+@router.get("/{user_id}/bookings")
+async def list_user_bookings(
+    user_id: int,
+    status: Optional[BookingStatus] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    A user's bookings with their destination embedded.
+    
+    One query however many bookings there are (destination is joined in);
+    replaces fetching each booking and destination separately.
+    """
+    query = (
+        select(Booking)
+        .options(joinedload(Booking.destination))
+        .where(Booking.user_id == user_id)
+        .order_by(Booking.departure_date, Booking.id)
+    )
+    if status:
+        query = query.where(Booking.status == status)
+    
+    result = await db.execute(query)
+    bookings = result.scalars().all()
+    
+    # Slow path only: an empty list vs an unknown user
+    if not bookings and await db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    return bookings
@@ -0,0 +1,117 @@
+"""
+Multi-worker launcher
+
+    python -m app.serve
+
+Binds the listening socket and creates the shared-memory counters
+(app.core.shared_state) in the parent, then forks WEB_CONCURRENCY uvicorn
+workers that inherit both. Crashed workers are restarted with exponential
+backoff; a worker that keeps dying right after start (bad config, DB down
+at import) makes the launcher stop and exit non-zero instead of fork-looping.
+
+Use this instead of `uvicorn --workers`: uvicorn spawns fresh
+interpreters, so each worker would get its own private counters.
+
+The parent must not import app.main. It starts the log listener thread
+and creates the engine, and neither survives a fork.
+"""
+
+import logging
+import multiprocessing
+import signal
+import sys
+import time
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.shared_state import shared_counters
+
+logger = logging.getLogger(__name__)
+
+
+def _uvicorn_config() -> uvicorn.Config:
+    return uvicorn.Config(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        log_config=None,  # app.core.logging_config owns logging in the workers
+    )
+
+
+def _run_worker(sock):
+    uvicorn.Server(_uvicorn_config()).run(sockets=[sock])
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    ctx = multiprocessing.get_context("fork")
+    sock = _uvicorn_config().bind_socket()
+    shared_counters.multiprocess = True
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    def spawn():
+        process = ctx.Process(target=_run_worker, args=(sock,), daemon=False)
+        process.start()
+        return process
+
+    workers = [spawn() for _ in range(settings.WEB_CONCURRENCY)]
+    started_at = [time.monotonic()] * len(workers)
+    rapid_failures = [0] * len(workers)
+    restart_at = [0.0] * len(workers)
+    gave_up = False
+    logger.info("Started %d workers on %s:%d", len(workers), settings.SERVER_HOST, settings.SERVER_PORT)
+
+    while not stopping:
+        now = time.monotonic()
+        for i, process in enumerate(workers):
+            if process is None:
+                if now >= restart_at[i]:
+                    workers[i] = spawn()
+                    started_at[i] = now
+                continue
+            if process.is_alive():
+                continue
+
+            if now - started_at[i] < settings.WORKER_MIN_UPTIME_SECONDS:
+                rapid_failures[i] += 1
+            else:
+                rapid_failures[i] = 0
+            if rapid_failures[i] >= settings.WORKER_MAX_RAPID_FAILURES:
+                logger.error(
+                    "Worker %d exited with %s; %d rapid failures in a row, giving up",
+                    process.pid, process.exitcode, rapid_failures[i]
+                )
+                gave_up = stopping = True
+                break
+            delay = min(
+                settings.WORKER_RESTART_BACKOFF_SECONDS * 2 ** rapid_failures[i],
+                settings.WORKER_RESTART_BACKOFF_MAX_SECONDS
+            )
+            logger.warning("Worker %d exited with %s, restarting in %.1fs", process.pid, process.exitcode, delay)
+            workers[i] = None
+            restart_at[i] = now + delay
+        time.sleep(0.5)
+
+    workers = [process for process in workers if process is not None]
+    for process in workers:
+        process.terminate()
+    for process in workers:
+        process.join(timeout=settings.SERVER_SHUTDOWN_TIMEOUT_SECONDS)
+        if process.is_alive():
+            process.kill()
+    sock.close()
+    if gave_up:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Availability Hub
+In-process pub/sub for live destination availability
+
+Publishers: booking create/cancel (after commit)
+Subscribers: GET /destinations/{id}/availability/stream (Server-Sent Events)
+
+The hub is per worker process. Under the multi-worker launcher
+(app.serve), writers also bump the shared `availability_epoch`. Every
+worker then re-reads the destinations its own clients watch, using
+`follow_other_workers`.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+
+from app.core.database import ReadOnlySessionLocal
+from app.core.http_cache import catalog_changed
+from app.core.shared_state import shared_counters
+from app.models.models import Destination
+
+logger = logging.getLogger(__name__)
+
+
+def format_availability_event(destination_id: int, current_availability: Optional[int], version: int = 0) -> str:
+    """Encode one SSE frame for an availability change"""
+    data = json.dumps({"destination_id": destination_id, "current_availability": current_availability})
+    return f"id: {version}\nevent: availability\ndata: {data}\n\n"
+
+
+class _Channel:
+    __slots__ = ("version", "value", "frame", "changed", "subscribers")
+
+    def __init__(self):
+        self.version = 0
+        self.value: Optional[int] = None
+        self.frame: Optional[str] = None
+        self.changed = asyncio.Event()
+        self.subscribers = 0
+
+
+class Subscription:
+    """A single client's view of one destination channel"""
+
+    def __init__(self, hub: "AvailabilityHub", destination_id: int, channel: _Channel):
+        self._hub = hub
+        self._destination_id = destination_id
+        self._channel = channel
+        self._seen = channel.version
+        self._closed = False
+
+    async def wait(self, timeout: float) -> Optional[str]:
+        """
+        Wait for a newer value than the last one returned.
+
+        Returns the latest encoded frame, or None on timeout. Intermediate
+        values published while the client was busy are skipped.
+        """
+        channel = self._channel
+        if channel.version == self._seen:
+            try:
+                await asyncio.wait_for(channel.changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        self._seen = channel.version
+        return channel.frame
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._hub._release(self._destination_id, self._channel)
+
+
+class AvailabilityHub:
+    """
+    Fan out `current_availability` changes per destination.
+
+    A channel only keeps the latest frame. Publishing encodes it once and
+    swaps the channel's Event, so every waiting subscriber wakes once and
+    reads the same string. Slow subscribers never build up a backlog.
+    """
+
+    def __init__(self):
+        self._channels: Dict[int, _Channel] = {}
+
+    def subscribe(self, destination_id: int) -> Subscription:
+        channel = self._channels.get(destination_id)
+        if channel is None:
+            channel = self._channels[destination_id] = _Channel()
+        channel.subscribers += 1
+        return Subscription(self, destination_id, channel)
+
+    def publish(self, destination_id: int, current_availability: Optional[int]):
+        channel = self._channels.get(destination_id)
+        if channel is None:
+            return  # Nobody is listening
+        if channel.version and channel.value == current_availability:
+            return  # Already announced (e.g. by this worker before the cross-worker sync)
+        channel.value = current_availability
+        channel.version += 1
+        channel.frame = format_availability_event(destination_id, current_availability, channel.version)
+        changed, channel.changed = channel.changed, asyncio.Event()
+        changed.set()
+
+    def watched_destinations(self) -> List[int]:
+        return list(self._channels)
+
+    def subscriber_count(self, destination_id: int) -> int:
+        channel = self._channels.get(destination_id)
+        return channel.subscribers if channel else 0
+
+    def _release(self, destination_id: int, channel: _Channel):
+        channel.subscribers -= 1
+        if channel.subscribers <= 0 and self._channels.get(destination_id) is channel:
+            del self._channels[destination_id]
+
+
+availability_hub = AvailabilityHub()
+
+
+def notify_availability_change(destination_id: int, current_availability: Optional[int]):
+    """Publish to this worker's subscribers and flag the change for other workers"""
+    availability_hub.publish(destination_id, current_availability)
+    catalog_changed("availability_epoch")
+
+
+async def follow_other_workers(interval: float):
+    """
+    Re-publish changes made by other workers (multi-worker mode only).
+
+    Polls the shared epoch; when it moved and this worker has
+    subscribers, reloads the watched destinations in one IN query.
+    """
+    seen = shared_counters.get("availability_epoch")
+    while True:
+        await asyncio.sleep(interval)
+        epoch = shared_counters.get("availability_epoch")
+        watched = availability_hub.watched_destinations()
+        if epoch == seen or not watched:
+            seen = epoch
+            continue
+        seen = epoch
+        try:
+            async with ReadOnlySessionLocal() as db:
+                rows = (await db.execute(
+                    select(Destination.id, Destination.current_availability)
+                    .where(Destination.id.in_(watched))
+                )).all()
+        except Exception:
+            logger.exception("Availability sync failed")
+            continue
+        for destination_id, current_availability in rows:
+            availability_hub.publish(destination_id, current_availability)
@@ -0,0 +1,99 @@
+"""
+Fare Service
+Precomputed base fares per destination in every supported currency
+
+Exchange rates come from EXCHANGE_RATES_FILE (JSON: {"EUR": 0.92, ...},
+units per USD) when set, otherwise from the exchange_rates table. The
+whole table is rebuilt off to the side and swapped in with a single
+assignment, so readers never see a half-built table. It is rebuilt
+lazily when the shared `catalog_epoch` moves; destination writes and rate
+updates bump it.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import ReadOnlySessionLocal
+from app.core.shared_state import shared_counters
+from app.models.models import Destination, ExchangeRate
+from app.services.pricing import round_currency
+
+logger = logging.getLogger(__name__)
+
+
+class FareTable:
+    """Immutable snapshot: rates and base fares for one catalog epoch"""
+
+    __slots__ = ("epoch", "rates", "prices")
+
+    def __init__(self, epoch: int, rates: Dict[str, float], prices: Dict[str, Dict[int, float]]):
+        self.epoch = epoch
+        self.rates = rates
+        self.prices = prices
+
+    def price(self, destination_id: int, currency: str) -> Optional[float]:
+        """Base fare in `currency`, or None for an unknown destination"""
+        return self.prices[currency].get(destination_id)
+
+
+class FareService:
+    def __init__(self, session_factory=ReadOnlySessionLocal):
+        self._session_factory = session_factory
+        self._table: Optional[FareTable] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def supported_currencies(self):
+        return [code.strip().upper() for code in settings.SUPPORTED_CURRENCIES.split(",") if code.strip()]
+
+    async def table(self) -> FareTable:
+        """Current table; rebuilt first if the catalog changed since it was built"""
+        epoch = shared_counters.get("catalog_epoch")
+        table = self._table
+        if table is not None and table.epoch == epoch:
+            return table
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._table is None or self._table.epoch != epoch:
+                self._table = await self._build(epoch)
+        return self._table
+
+    def invalidate(self):
+        self._table = None
+
+    async def _load_rates(self, db) -> Dict[str, float]:
+        if settings.EXCHANGE_RATES_FILE:
+            with open(settings.EXCHANGE_RATES_FILE) as f:
+                raw = json.load(f)
+        else:
+            result = await db.execute(select(ExchangeRate.currency, ExchangeRate.units_per_usd))
+            raw = dict(result.all())
+        rates = {"USD": 1.0}
+        for code in self.supported_currencies:
+            if code in raw and code != "USD":
+                rates[code] = float(raw[code])
+        missing = set(self.supported_currencies) - set(rates)
+        if missing:
+            logger.warning("No exchange rate for %s; not quoted", ", ".join(sorted(missing)))
+        return rates
+
+    async def _build(self, epoch: int) -> FareTable:
+        async with self._session_factory() as db:
+            rates = await self._load_rates(db)
+            result = await db.execute(select(Destination.id, Destination.base_price_usd))
+            base_prices = result.all()
+        prices = {
+            currency: {dest_id: round_currency(usd * rate, currency) for dest_id, usd in base_prices}
+            for currency, rate in rates.items()
+        }
+        logger.info("Fare table rebuilt: %d destinations x %d currencies", len(base_prices), len(rates))
+        return FareTable(epoch, rates, prices)
+
+
+fare_service = FareService()
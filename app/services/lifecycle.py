@@ -0,0 +1,193 @@
+"""
+Booking Lifecycle Scheduler
+Moves bookings through their terminal states in the background
+
+- PENDING older than BOOKING_HOLD_MINUTES  -> CANCELLED, seats returned
+- CONFIRMED with a past departure_date     -> COMPLETED
+
+Started from the app lifespan. Every worker runs one; rows are claimed
+with FOR UPDATE SKIP LOCKED so workers (and live booking requests) never
+wait on each other.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import bindparam, select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.models import Booking, BookingStatus, Destination
+from app.services.availability import notify_availability_change
+
+logger = logging.getLogger(__name__)
+
+
+class BookingLifecycleScheduler:
+    """
+    Periodic, batch-limited status transitions.
+
+    Each batch is one transaction of a few set-based statements. A tick
+    keeps taking batches while they come back full, up to
+    LIFECYCLE_MAX_BATCHES_PER_TICK, then sleeps LIFECYCLE_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self._session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+        self._metrics: Dict[str, Any] = {
+            "ticks": 0,
+            "errors": 0,
+            "last_run_at": None,
+            "last_tick_seconds": 0.0,
+            "expired_total": 0,
+            "completed_total": 0,
+            "expired_last_tick": 0,
+            "completed_last_tick": 0,
+            "expiry_lag_seconds": 0.0,
+            "completion_lag_seconds": 0.0,
+            "throughput_per_second": 0.0,
+        }
+
+    # -- lifecycle -----------------------------------------------------
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._metrics["errors"] += 1
+                logger.exception("Booking lifecycle tick failed")
+            await asyncio.sleep(settings.LIFECYCLE_INTERVAL_SECONDS)
+
+    # -- work ----------------------------------------------------------
+
+    async def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Run one tick. Returns the number of bookings moved per transition."""
+        now = now or datetime.utcnow()
+        started = time.perf_counter()
+        batch_size = settings.LIFECYCLE_BATCH_SIZE
+        expired = completed = 0
+        expiry_lag = completion_lag = 0.0
+
+        for _ in range(settings.LIFECYCLE_MAX_BATCHES_PER_TICK):
+            count, lag = await self._expire_batch(now, batch_size)
+            expired += count
+            expiry_lag = max(expiry_lag, lag)
+            if count < batch_size:
+                break
+
+        for _ in range(settings.LIFECYCLE_MAX_BATCHES_PER_TICK):
+            count, lag = await self._complete_batch(now, batch_size)
+            completed += count
+            completion_lag = max(completion_lag, lag)
+            if count < batch_size:
+                break
+
+        elapsed = time.perf_counter() - started
+        metrics = self._metrics
+        metrics["ticks"] += 1
+        metrics["last_run_at"] = now.isoformat()
+        metrics["last_tick_seconds"] = round(elapsed, 4)
+        metrics["expired_total"] += expired
+        metrics["completed_total"] += completed
+        metrics["expired_last_tick"] = expired
+        metrics["completed_last_tick"] = completed
+        metrics["expiry_lag_seconds"] = round(expiry_lag, 1)
+        metrics["completion_lag_seconds"] = round(completion_lag, 1)
+        metrics["throughput_per_second"] = round((expired + completed) / elapsed, 1) if elapsed else 0.0
+        return {"expired": expired, "completed": completed}
+
+    async def _expire_batch(self, now: datetime, batch_size: int):
+        cutoff = now - timedelta(minutes=settings.BOOKING_HOLD_MINUTES)
+        async with self._session_factory() as db:
+            async with db.begin():
+                rows = (await db.execute(
+                    select(Booking.id, Booking.destination_id, Booking.passenger_count, Booking.created_at)
+                    .where(Booking.status == BookingStatus.PENDING, Booking.created_at < cutoff)
+                    .order_by(Booking.id)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )).all()
+                if not rows:
+                    return 0, 0.0
+
+                await db.execute(
+                    update(Booking)
+                    .where(Booking.id.in_([row.id for row in rows]))
+                    .values(status=BookingStatus.CANCELLED, updated_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+
+                seats: Dict[int, int] = {}
+                for row in rows:
+                    seats[row.destination_id] = seats.get(row.destination_id, 0) + row.passenger_count
+                destinations = Destination.__table__
+                await db.execute(
+                    destinations.update()
+                    .where(destinations.c.id == bindparam("d_id"), destinations.c.current_availability.isnot(None))
+                    .values(current_availability=destinations.c.current_availability + bindparam("d_seats")),
+                    [{"d_id": d_id, "d_seats": seats[d_id]} for d_id in sorted(seats)]
+                )
+                availability = (await db.execute(
+                    select(Destination.id, Destination.current_availability)
+                    .where(Destination.id.in_(list(seats)))
+                )).all()
+
+        for destination_id, current_availability in availability:
+            notify_availability_change(destination_id, current_availability)
+        oldest_due = min(row.created_at for row in rows) + timedelta(minutes=settings.BOOKING_HOLD_MINUTES)
+        return len(rows), (now - oldest_due).total_seconds()
+
+    async def _complete_batch(self, now: datetime, batch_size: int):
+        async with self._session_factory() as db:
+            async with db.begin():
+                rows = (await db.execute(
+                    select(Booking.id, Booking.departure_date)
+                    .where(Booking.status == BookingStatus.CONFIRMED, Booking.departure_date < now)
+                    .order_by(Booking.id)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )).all()
+                if not rows:
+                    return 0, 0.0
+
+                await db.execute(
+                    update(Booking)
+                    .where(Booking.id.in_([row.id for row in rows]))
+                    .values(status=BookingStatus.COMPLETED, updated_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+
+        oldest_due = min(row.departure_date for row in rows)
+        return len(rows), (now - oldest_due).total_seconds()
+
+    # -- metrics -------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Lag is how overdue the oldest booking handled in the last tick was.
+        It grows while batches stay full, i.e. the scheduler is behind.
+        """
+        return {"running": self._task is not None and not self._task.done(), **self._metrics}
+
+
+lifecycle_scheduler = BookingLifecycleScheduler()
@@ -0,0 +1,163 @@
+"""
+Loyalty Service
+Points accrual and tier recomputation for completed bookings
+
+Runs as a background job, never in the booking request path:
+    python -m app.services.loyalty
+
+Each chunk is one short transaction that marks its bookings, credits
+their users and advances the checkpoint together. A crash loses at most
+the chunk in flight, and re-running never double-credits a booking.
+"""
+
+import asyncio
+import logging
+import math
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, case, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.models import Booking, BookingStatus, JobCheckpoint, User
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "loyalty_accrual"
+
+# Lifetime points needed for each tier, highest first.
+# Tier names match PricingService.LOYALTY_DISCOUNTS.
+LOYALTY_TIER_THRESHOLDS = [
+    ("diamond", 5_000_000),
+    ("platinum", 1_000_000),
+    ("gold", 250_000),
+    ("silver", 50_000),
+    ("bronze", 0),
+]
+
+
+class LoyaltyService:
+    """
+    Accrues LOYALTY_POINTS_MULTIPLIER points per USD of COMPLETED bookings.
+
+    Bookings are walked in primary-key order from a durable checkpoint
+    that only ever advances. `Booking.loyalty_points_awarded` is the
+    idempotency marker. Bookings that complete after the walk has passed
+    their id are picked up from the pending partial index once the walk
+    is caught up, without moving the checkpoint back.
+    """
+
+    def points_for(self, total_price: Optional[float]) -> int:
+        return int(math.floor((total_price or 0) * settings.LOYALTY_POINTS_MULTIPLIER))
+
+    def tier_for(self, points: int) -> str:
+        for tier, threshold in LOYALTY_TIER_THRESHOLDS:
+            if points >= threshold:
+                return tier
+        return "bronze"
+
+    def _tier_case(self, points_expr):
+        return case(
+            *[(points_expr >= threshold, tier) for tier, threshold in LOYALTY_TIER_THRESHOLDS[:-1]],
+            else_=LOYALTY_TIER_THRESHOLDS[-1][0]
+        )
+
+    async def _lock_checkpoint(self, db) -> JobCheckpoint:
+        """
+        Create the checkpoint row if missing, then lock it.
+        The insert is a no-op when another runner got there first, so the
+        locking read always finds a row and first runs cannot collide.
+        """
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        await db.execute(
+            dialect.insert(JobCheckpoint)
+            .values(name=CHECKPOINT_NAME, position=0)
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        # Row lock on the checkpoint serializes concurrent runners
+        return await db.get(JobCheckpoint, CHECKPOINT_NAME, with_for_update=True, populate_existing=True)
+
+    async def _pending(self, db, position_filter, limit: int):
+        result = await db.execute(
+            select(Booking.id, Booking.user_id, Booking.total_price)
+            .where(
+                Booking.status == BookingStatus.COMPLETED,
+                Booking.loyalty_points_awarded.is_(None),
+                position_filter
+            )
+            .order_by(Booking.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)  # Never wait on live booking writes
+        )
+        return result.all()
+
+    async def accrue_chunk(self, db, chunk_size: int) -> int:
+        """
+        Process one chunk inside the caller's transaction.
+        Returns the number of bookings accrued.
+        """
+        checkpoint = await self._lock_checkpoint(db)
+        position = checkpoint.position
+
+        rows = await self._pending(db, Booking.id > position, chunk_size)
+        if rows:
+            checkpoint.position = rows[-1].id
+        if len(rows) < chunk_size:
+            # Caught up: fill the chunk with late completions behind the checkpoint
+            rows += await self._pending(db, Booking.id <= position, chunk_size - len(rows))
+
+        if rows:
+            awarded: List[dict] = []
+            per_user: Dict[int, int] = {}
+            for row in rows:
+                points = self.points_for(row.total_price)
+                awarded.append({"b_id": row.id, "b_points": points})
+                per_user[row.user_id] = per_user.get(row.user_id, 0) + points
+
+            bookings = Booking.__table__
+            await db.execute(
+                bookings.update()
+                .where(bookings.c.id == bindparam("b_id"))
+                .values(loyalty_points_awarded=bindparam("b_points")),
+                awarded
+            )
+
+            # One executemany for the whole chunk; the tier is derived from the
+            # new balance in the same statement. Sorted ids keep lock order stable.
+            users = User.__table__
+            new_points = func.coalesce(users.c.loyalty_points, 0) + bindparam("u_points")
+            await db.execute(
+                users.update()
+                .where(users.c.id == bindparam("u_id"))
+                .values(loyalty_points=new_points, loyalty_tier=self._tier_case(new_points)),
+                [{"u_id": user_id, "u_points": per_user[user_id]} for user_id in sorted(per_user)]
+            )
+
+        return len(rows)
+
+    async def run_accrual(
+        self,
+        chunk_size: Optional[int] = None,
+        max_chunks: Optional[int] = None,
+        session_factory=AsyncSessionLocal
+    ) -> int:
+        """Accrue chunk by chunk until caught up (or max_chunks). Returns bookings accrued."""
+        chunk_size = chunk_size or settings.LOYALTY_ACCRUAL_CHUNK_SIZE
+        total = 0
+        chunks = 0
+        while max_chunks is None or chunks < max_chunks:
+            async with session_factory() as db:
+                async with db.begin():
+                    processed = await self.accrue_chunk(db, chunk_size)
+            total += processed
+            chunks += 1
+            if processed < chunk_size:
+                break
+        logger.info("Loyalty accrual: %d bookings in %d chunks", total, chunks)
+        return total
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(LoyaltyService().run_accrual())
@@ -8,8 +8,17 @@ Integration Status:
 - Push: Not implemented (SP-209 - Won't Fix)
 """
 
+import asyncio
+import json
 import logging
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import or_, select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.models import OutboxEvent
 
 logger = logging.getLogger(__name__)
 
@@ -33,10 +42,10 @@ class NotificationService:
         """Send email notification via SendGrid"""
         try:
             # TODO: Actual SendGrid integration (SP-207)
-            logger.info(f"[EMAIL] To: {to_email}, Subject: {subject}")
+            logger.info("[EMAIL] To: %s, Subject: %s", to_email, subject)
             return True
         except Exception as e:
-            logger.error(f"Failed to send email: {e}")
+            logger.error("Failed to send email: %s", e)
             return False
     
     async def send_sms(self, phone_number: str, message: str) -> bool:
@@ -53,33 +62,141 @@ class NotificationService:
 _notification_service = NotificationService()
 
 
-def send_booking_confirmation(booking_id: int):
+def send_cancellation_notification(booking_id: int, refund_amount: float):
+    """Send cancellation notification - SP-210 (Not started)"""
+    logger.info("[STUB] Cancellation notification for booking %s", booking_id)
+
+
+class OutboxRelay:
     """
-    Send booking confirmation notification.
-    
-    Fixed in SP-211: Now properly handles async execution
-    (Note: Still has race condition issue, may not complete before response)
+    Deliver outbox events written inside request transactions.
+
+    A pass claims a batch (FOR UPDATE SKIP LOCKED), bumps each event's
+    attempts and leases it for OUTBOX_CLAIM_SECONDS, and commits. Delivery
+    then runs with no transaction or pooled connection held, and a second
+    short transaction marks the results. Delivery is at least once: if the
+    relay dies between the two, the lease runs out and the event is sent
+    again.
+
+    A failed event (False from the sender, or any exception, such as a
+    malformed payload) only affects itself. It is retried with
+    exponential backoff, so newer events are not stuck behind it, and
+    dead-lettered (failed_at) after OUTBOX_MAX_ATTEMPTS.
     """
-    import asyncio
     
-    async def _send():
-        await _notification_service.send_email(
-            to_email="user@example.com",
-            subject="SpacePort Booking Confirmed!",
-            body=f"Your booking #{booking_id} has been confirmed."
-        )
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self._session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
     
-    # "Fixed" - but still has the same issue
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            loop.create_task(_send())
-        else:
-            loop.run_until_complete(_send())
-    except RuntimeError:
-        logger.error(f"Failed to send confirmation for booking {booking_id}")
+    def start(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._loop())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def wake(self):
+        """Called after a commit that wrote to the outbox"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    async def _loop(self):
+        while True:
+            try:
+                while await self.run_once() == settings.OUTBOX_BATCH_SIZE:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Outbox relay failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.OUTBOX_RELAY_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+    
+    async def run_once(self) -> int:
+        """Deliver one batch. Returns the number of events delivered (failures are not counted)."""
+        delivered, failed = [], []
+        for event_id, topic, payload, attempts in await self._claim():
+            try:
+                ok = await self._deliver(topic, json.loads(payload))
+            except Exception:
+                logger.exception("Outbox event %s (%s) raised during delivery", event_id, topic)
+                ok = False
+            if ok:
+                delivered.append(event_id)
+            else:
+                failed.append((event_id, topic, attempts))
+        if delivered or failed:
+            await self._settle(delivered, failed)
+        return len(delivered)
+    
+    async def _claim(self) -> List[Tuple[int, str, str, int]]:
+        now = datetime.utcnow()
+        async with self._session_factory() as db:
+            async with db.begin():
+                result = await db.execute(
+                    select(OutboxEvent.id, OutboxEvent.topic, OutboxEvent.payload, OutboxEvent.attempts)
+                    .where(
+                        OutboxEvent.published_at.is_(None),
+                        OutboxEvent.failed_at.is_(None),
+                        or_(OutboxEvent.next_attempt_at.is_(None), OutboxEvent.next_attempt_at <= now),
+                    )
+                    .order_by(OutboxEvent.id)
+                    .limit(settings.OUTBOX_BATCH_SIZE)
+                    .with_for_update(skip_locked=True)
+                )
+                rows = result.all()
+                if rows:
+                    await db.execute(
+                        update(OutboxEvent)
+                        .where(OutboxEvent.id.in_([row.id for row in rows]))
+                        .values(
+                            attempts=OutboxEvent.attempts + 1,
+                            next_attempt_at=now + timedelta(seconds=settings.OUTBOX_CLAIM_SECONDS),
+                        )
+                    )
+        return [(row.id, row.topic, row.payload, row.attempts + 1) for row in rows]
+    
+    async def _settle(self, delivered: List[int], failed: List[Tuple[int, str, int]]):
+        now = datetime.utcnow()
+        async with self._session_factory() as db:
+            async with db.begin():
+                if delivered:
+                    await db.execute(
+                        update(OutboxEvent).where(OutboxEvent.id.in_(delivered)).values(published_at=now)
+                    )
+                for event_id, topic, attempts in failed:
+                    if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                        logger.error("Outbox event %s (%s) dead-lettered after %s attempts", event_id, topic, attempts)
+                        values = {"failed_at": now}
+                    else:
+                        delay = min(settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+                                    settings.OUTBOX_RETRY_MAX_SECONDS)
+                        logger.warning("Outbox event %s (%s) not delivered; retry in %.0fs", event_id, topic, delay)
+                        values = {"next_attempt_at": now + timedelta(seconds=delay)}
+                    await db.execute(update(OutboxEvent).where(OutboxEvent.id == event_id).values(**values))
+    
+    async def _deliver(self, topic: str, payload: dict) -> bool:
+        """False if the event must stay unpublished for a retry"""
+        if topic == "booking.created":
+            return await _notification_service.send_email(
+                to_email="user@example.com",
+                subject="SpacePort Booking Confirmed!",
+                body=f"Your booking {payload['reference_code']} has been confirmed."
+            )
+        # Nothing will ever handle it: retrying would only burn attempts
+        logger.warning("No handler for outbox topic %s", topic)
+        return True
 
 
-def send_cancellation_notification(booking_id: int, refund_amount: float):
-    """Send cancellation notification - SP-210 (Not started)"""
-    logger.info(f"[STUB] Cancellation notification for booking {booking_id}")
+outbox_relay = OutboxRelay()
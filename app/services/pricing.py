@@ -10,6 +10,13 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from app.core.config import settings
 
+# Minor units per ISO 4217; anything not listed has 2
+CURRENCY_DECIMALS = {"JPY": 0, "KRW": 0}
+
+
+def round_currency(amount: float, currency: str = "USD") -> float:
+    return round(amount, CURRENCY_DECIMALS.get(currency, 2))
+
 
 class PricingService:
     """
@@ -46,8 +53,14 @@ class PricingService:
         passenger_count: int,
         departure_date: datetime,
         discount_code: Optional[str] = None,
-        user_loyalty_tier: Optional[str] = None
+        user_loyalty_tier: Optional[str] = None,
+        currency: str = "USD",
+        fx_rate: float = 1.0
     ) -> Dict[str, Any]:
+        """
+        `base_price` is in `currency`; `fx_rate` is that currency's units
+        per USD, used for the USD-denominated thresholds and fees.
+        """
         subtotal = base_price * passenger_count
         discounts = []
         total_discount_percent = 0
@@ -91,7 +104,7 @@ class PricingService:
             promo = self.PROMO_CODES.get(discount_code.upper())
             if promo:
                 # BUG: Should check valid_until date but doesn't!
-                if subtotal >= promo["min_amount"]:
+                if subtotal >= promo["min_amount"] * fx_rate:
                     discounts.append({
                         "type": "promo",
                         "percent": promo["discount"],
@@ -113,15 +126,15 @@ class PricingService:
         final_total = subtotal - discount_amount + tax_amount
         
         return {
-            "subtotal": round(subtotal, 2),
+            "subtotal": round_currency(subtotal, currency),
             "discounts": discounts,
             "total_discount_percent": round(total_discount_percent, 2),
-            "discount": round(discount_amount, 2),
+            "discount": round_currency(discount_amount, currency),
             "tax_rate": tax_rate,
-            "tax_amount": round(tax_amount, 2),
-            "total": round(final_total, 2),
-            "currency": "USD",
-            "insurance_fee_per_passenger": 500  # Docs say $299
+            "tax_amount": round_currency(tax_amount, currency),
+            "total": round_currency(final_total, currency),
+            "currency": currency,
+            "insurance_fee_per_passenger": round_currency(500 * fx_rate, currency)  # Docs say $299
         }
     
     def calculate_refund(
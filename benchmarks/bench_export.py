@@ -0,0 +1,128 @@
+"""
+Finance export throughput benchmark
+
+    python -m benchmarks.bench_export --rows 10000000 --format parquet
+
+Seeds ROWS bookings into a scratch database (BENCH_DATABASE_URL, default:
+a temp SQLite file) in a child process, then streams
+/api/v2/exports/bookings through the ASGI app. Reports rows/s, MB/s and
+peak RSS. ru_maxrss is a high-water mark (and on Linux a child inherits
+its parent's), so seeding runs in the child and the export in this
+process, whose peak then covers startup and the export only. The app is
+driven directly over ASGI and each body chunk is discarded as it is sent
+(httpx's ASGITransport would buffer the whole response).
+
+With BENCH_DATABASE_URL pointing at an already seeded database,
+--skip-seed runs only the export (pass the seeded --rows for rows/s):
+
+    BENCH_DATABASE_URL=... python -m benchmarks.bench_export --skip-seed --rows 10000000 --format arrow
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--rows", type=int, default=1_000_000)
+parser.add_argument("--format", choices=["csv", "arrow", "parquet"], default="csv")
+parser.add_argument("--chunk-size", type=int, default=10_000)
+parser.add_argument("--skip-seed", action="store_true", help="export only (BENCH_DATABASE_URL must be seeded)")
+parser.add_argument("--seed-only", action="store_true", help=argparse.SUPPRESS)  # The seeding child
+args = parser.parse_args()
+
+# Pinned so the seeding child writes the database this process exports
+os.environ.setdefault("BENCH_DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+os.environ["DEBUG"] = "false"
+os.environ["ADMIN_TOKEN"] = "bench"
+os.environ["EXPORT_CHUNK_SIZE"] = str(args.chunk_size)
+
+from app.core.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.models import Booking, BookingStatus, Destination, User  # noqa: E402
+
+
+async def seed(rows: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(User.__table__.insert(), [
+            {"id": i, "email": f"user{i}@example.com", "hashed_password": "x"} for i in range(1, 1001)
+        ])
+        await conn.execute(Destination.__table__.insert(), [
+            {"id": i, "name": f"Dest {i}", "code": f"D-{i:03d}", "base_price_usd": 1000.0 * i} for i in range(1, 21)
+        ])
+    start = datetime(2030, 1, 1)
+    batch = 50_000
+    for offset in range(0, rows, batch):
+        async with engine.begin() as conn:
+            await conn.execute(Booking.__table__.insert(), [{
+                "reference_code": f"SP-{n:010d}", "user_id": 1 + n % 1000, "destination_id": 1 + n % 20,
+                "departure_date": start + timedelta(days=400), "created_at": start + timedelta(seconds=n),
+                "passenger_count": 1 + n % 6, "total_price": 1000.0 + n % 9000, "discount_applied": 0.0,
+                "status": BookingStatus.CONFIRMED.name,
+            } for n in range(offset, min(offset + batch, rows))])
+
+
+async def export(fmt: str):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/v2/exports/bookings", "raw_path": b"/api/v2/exports/bookings",
+        "query_string": f"format={fmt}".encode(), "root_path": "",
+        "headers": [(b"host", b"bench"), (b"x-admin-token", b"bench")],
+        "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    size = 0
+    status = None
+
+    async def receive():
+        await asyncio.sleep(3600)  # Never disconnects
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal size, status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    if status != 200:
+        raise SystemExit(f"export failed with HTTP {status}")
+    return time.perf_counter() - started, size
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_export():
+    rss_before = _peak_rss_mb()
+    elapsed, size = await export(args.format)
+    print(f"{args.format}: {args.rows:,} rows, {size / 1e6:.1f} MB in {elapsed:.2f}s "
+          f"-> {args.rows / elapsed:,.0f} rows/s, {size / 1e6 / elapsed:.1f} MB/s")
+    print(f"peak RSS: {rss_before:.0f} MB after startup, {_peak_rss_mb():.0f} MB after export")
+    await engine.dispose()
+
+
+async def run_seed():
+    started = time.perf_counter()
+    await seed(args.rows)
+    await engine.dispose()
+    print(f"seeded {args.rows:,} rows in {time.perf_counter() - started:.1f}s (seeding peak RSS {_peak_rss_mb():.0f} MB)")
+
+
+if __name__ == "__main__":
+    if args.seed_only:
+        asyncio.run(run_seed())
+    else:
+        if not args.skip_seed:
+            subprocess.run([sys.executable, "-m", "benchmarks.bench_export", *sys.argv[1:], "--seed-only"], check=True)
+        asyncio.run(run_export())
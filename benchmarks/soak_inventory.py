@@ -0,0 +1,220 @@
+"""
+Inventory soak / oversell harness
+
+    python -m benchmarks.soak_inventory --requests 5000 --concurrency 200 --capacity 300
+
+Seeds one destination with CAPACITY seats in a scratch database
+(BENCH_DATABASE_URL, default: a temp SQLite file), then fires a random
+mix of create_booking and cancel_booking calls at it through the ASGI
+app. Cancels pick any earlier booking, so some race each other on the
+same booking. Afterwards it checks the inventory invariants:
+
+  - current_availability never went negative (polled during the run, and at the end)
+  - seats on non-cancelled bookings + current_availability == capacity
+  - no booking was cancelled successfully more than once
+
+It reports throughput, status counts, request latency and lock wait:
+time spent inside `UPDATE destinations` statements, which under contention
+is dominated by waiting for the row lock (PostgreSQL) or the database
+write lock (SQLite). Exits 1 if an invariant fails or any request errors.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+DEPARTURE = (datetime.utcnow() + timedelta(days=60)).isoformat()
+
+
+@dataclass
+class SoakResult:
+    elapsed: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+    latencies: List[float] = field(default_factory=list)
+    lock_waits: List[float] = field(default_factory=list)
+    min_availability_seen: int = 0
+    cancelled_ok: Counter = field(default_factory=Counter)
+    violations: List[str] = field(default_factory=list)
+
+    @property
+    def errors(self) -> int:
+        return sum(n for (op, status), n in self.statuses.items() if status >= 500 and status != 503)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def seed(capacity: int, users: int = 50, destination_id: int = 1):
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import Destination, User
+
+    async with AsyncSessionLocal() as db:
+        db.add_all([User(id=i, email=f"soak{i}@example.com", hashed_password="x") for i in range(1, users + 1)])
+        db.add(Destination(id=destination_id, name="Soak Station", code="SOAK-01", base_price_usd=1000.0,
+                           max_capacity=capacity, current_availability=capacity))
+        await db.commit()
+
+
+async def check_invariants(result: SoakResult, capacity: int, destination_id: int = 1):
+    from sqlalchemy import func, select
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import Booking, BookingStatus, Destination
+
+    async with AsyncSessionLocal() as db:
+        available = await db.scalar(
+            select(Destination.current_availability).where(Destination.id == destination_id)
+        )
+        sold = await db.scalar(
+            select(func.coalesce(func.sum(Booking.passenger_count), 0))
+            .where(Booking.destination_id == destination_id, Booking.status != BookingStatus.CANCELLED)
+        )
+
+    result.min_availability_seen = min(result.min_availability_seen, available)
+    if result.min_availability_seen < 0:
+        result.violations.append(f"availability went negative ({result.min_availability_seen})")
+    if sold + available != capacity:
+        result.violations.append(f"sold {sold} + available {available} != capacity {capacity}")
+    doubled = [booking_id for booking_id, n in result.cancelled_ok.items() if n > 1]
+    if doubled:
+        result.violations.append(f"{len(doubled)} bookings cancelled more than once")
+
+
+async def soak(client, requests: int, concurrency: int, capacity: int, cancel_ratio: float = 0.3,
+               users: int = 50, destination_id: int = 1, rng_seed: int = 0) -> SoakResult:
+    """Run the mixed workload through `client` (an httpx.AsyncClient on the app) and check invariants"""
+    from sqlalchemy import event, select
+    from app.core.database import ReadOnlySessionLocal, engine
+    from app.models.models import Destination
+
+    rng = random.Random(rng_seed)
+    result = SoakResult(min_availability_seen=capacity)
+    booked: List[int] = []
+    gate = asyncio.Semaphore(concurrency)
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        context._soak_started = time.perf_counter()
+
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE DESTINATIONS"):
+            result.lock_waits.append(time.perf_counter() - context._soak_started)
+
+    async def book():
+        response = await client.post("/api/v2/bookings/", params={
+            "user_id": rng.randint(1, users), "destination_id": destination_id,
+            "departure_date": DEPARTURE, "passenger_count": rng.randint(1, 4),
+        })
+        if response.status_code == 200:
+            booked.append(response.json()["id"])
+        return response
+
+    async def cancel():
+        booking_id = rng.choice(booked)
+        response = await client.post(f"/api/v2/bookings/{booking_id}/cancel")
+        if response.status_code == 200:
+            result.cancelled_ok[booking_id] += 1
+        return response
+
+    async def one():
+        async with gate:
+            op = cancel if booked and rng.random() < cancel_ratio else book
+            started = time.perf_counter()
+            response = await op()
+            result.latencies.append(time.perf_counter() - started)
+        result.statuses[(op.__name__, response.status_code)] += 1
+
+    async def monitor():
+        while not finished.is_set():
+            async with ReadOnlySessionLocal() as db:
+                available = await db.scalar(
+                    select(Destination.current_availability).where(Destination.id == destination_id)
+                )
+            result.min_availability_seen = min(result.min_availability_seen, available)
+            await asyncio.sleep(0.005)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_execute)
+    finished = asyncio.Event()
+    watcher = asyncio.create_task(monitor())
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(one() for _ in range(requests)))
+    finally:
+        result.elapsed = time.perf_counter() - started
+        # Stop between polls: cancelling mid-query can leave SQLite's read lock held until GC
+        finished.set()
+        await watcher
+        event.remove(engine.sync_engine, "before_cursor_execute", before_execute)
+        event.remove(engine.sync_engine, "after_cursor_execute", after_execute)
+
+    await check_invariants(result, capacity, destination_id)
+    return result
+
+
+def report(result: SoakResult, requests: int) -> str:
+    statuses: Dict[str, str] = {}
+    for (op, status), n in sorted(result.statuses.items()):
+        statuses.setdefault(op, "")
+        statuses[op] += f" {status}x{n}"
+    lines = [
+        f"{requests:,} requests in {result.elapsed:.2f}s -> {requests / result.elapsed:,.0f} req/s",
+        *(f"  {op}:{counts}" for op, counts in statuses.items()),
+        f"latency p50 {_percentile(result.latencies, 50) * 1000:.1f} ms, "
+        f"p99 {_percentile(result.latencies, 99) * 1000:.1f} ms",
+        f"lock wait (UPDATE destinations): {len(result.lock_waits):,} statements, "
+        f"total {sum(result.lock_waits):.2f}s, p50 {_percentile(result.lock_waits, 50) * 1000:.2f} ms, "
+        f"p99 {_percentile(result.lock_waits, 99) * 1000:.2f} ms",
+        f"min availability seen: {result.min_availability_seen}",
+    ]
+    lines += [f"VIOLATION: {violation}" for violation in result.violations] or ["invariants hold"]
+    return "\n".join(lines)
+
+
+async def main(args) -> int:
+    import httpx
+    from app.core.database import Base, engine
+    from app.main import app
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # One INFO line per request otherwise
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(args.capacity)
+
+    # Unhandled errors become 500s in the report instead of aborting the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://soak") as client:
+        result = await soak(client, args.requests, args.concurrency, args.capacity, args.cancel_ratio)
+    await engine.dispose()
+
+    print(report(result, args.requests))
+    return 1 if result.violations or result.errors else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--capacity", type=int, default=300)
+    parser.add_argument("--cancel-ratio", type=float, default=0.3)
+    parser.add_argument("--no-admission", action="store_true", help="disable admission control (no 503s)")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = os.environ.get(
+        "BENCH_DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/soak.db"
+    )
+    os.environ["DEBUG"] = "false"
+    if args.no_admission:
+        os.environ["ADMISSION_CONTROL_ENABLED"] = "false"
+    raise SystemExit(asyncio.run(main(args)))
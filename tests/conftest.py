@@ -0,0 +1,162 @@
+"""
+Shared test fixtures
+
+The app is pointed at a throwaway SQLite database before it is imported,
+so routers and sessions opened outside dependencies run their real code.
+Set TEST_DATABASE_URL to run against another database (it is wiped).
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import event
+
+_db_dir = tempfile.mkdtemp(prefix="spaceport-tests-")
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL", f"sqlite+aiosqlite:///{_db_dir}/spaceport.db"
+)
+os.environ["DEBUG"] = "false"
+
+
+@pytest.fixture
+def run_async():
+    """
+    Run a scenario coroutine against a fresh schema.
+
+    Each call gets its own event loop, so pooled connections are disposed
+    before the loop closes.
+    """
+    from app.core.database import engine, Base
+    import app.models.models  # noqa: F401 - register tables
+
+    def run(scenario):
+        async def wrapper():
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.run_sync(Base.metadata.create_all)
+            try:
+                return await scenario()
+            finally:
+                await engine.dispose()
+        return asyncio.run(wrapper())
+
+    return run
+
+
+@pytest.fixture
+def api_client():
+    """Factory for an httpx client wired straight to the ASGI app"""
+    import httpx
+    from app.main import app
+
+    def make():
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    return make
+
+
+async def _seed_catalog(destinations=1, current_availability=10, password=None):
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import Destination, User
+    from app.routers.users import hash_password
+
+    async with AsyncSessionLocal() as db:
+        db.add(User(id=1, email="pilot@example.com",
+                    hashed_password=hash_password(password) if password else "x"))
+        db.add(Destination(id=1, name="Mars Base", code="MARS-01", base_price_usd=100_000.0,
+                           description="Scenic route past the rings " * 4,
+                           max_capacity=10, current_availability=current_availability))
+        for d in range(2, destinations + 1):
+            db.add(Destination(id=d, name=f"Destination {d}", code=f"DST-{d:02d}", base_price_usd=1000.0 * d,
+                               description="Scenic route past the rings " * 4,
+                               max_capacity=10, current_availability=10))
+        await db.commit()
+
+
+@pytest.fixture
+def seed_catalog():
+    """
+    Async seeder for the common case: user 1 (pilot@example.com) and
+    destination 1, Mars Base / MARS-01, with 10 seats. `destinations=N`
+    adds DST-02..DST-N; `password` makes the user able to log in.
+    """
+    return _seed_catalog
+
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    """Enable the admin API and return headers that authenticate against it"""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    return {"X-Admin-Token": "s3cret"}
+
+
+class StatementLog:
+    """Statements sent to the database, and COMMITs, while the context is active"""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.statements = []
+        self.commits = 0
+
+    @property
+    def verbs(self):
+        return [statement.split()[0].upper() for statement in self.statements]
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _on_commit(self, conn):
+        self.commits += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        event.listen(self.engine, "commit", self._on_commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        event.remove(self.engine, "commit", self._on_commit)
+
+
+@pytest.fixture
+def statement_log():
+    """Factory for a StatementLog on the app engine: `with statement_log() as log: ...`"""
+    from app.core.database import engine
+
+    return lambda: StatementLog(engine)
+
+
+# Relationships that must always be loaded eagerly (selectinload/joinedload)
+# by routers; a lazy load on any of them is an N+1 in production.
+GUARDED_RELATIONSHIPS = {"User.bookings", "Booking.destination", "Booking.user"}
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "allow_lazy_loads: do not fail the test on guarded lazy loads")
+
+
+@pytest.fixture(autouse=True)
+def no_lazy_relationship_loads(request):
+    """Fail the test if anything lazy-loads a guarded relationship"""
+    from sqlalchemy.orm import Session
+
+    violations = []
+
+    def guard(state):
+        if not state.is_relationship_load or state.lazy_loaded_from is None:
+            return
+        prop = state.loader_strategy_path[-1]
+        name = f"{prop.parent.class_.__name__}.{prop.key}"
+        if name in GUARDED_RELATIONSHIPS:
+            violations.append(name)
+            raise AssertionError(f"Lazy load of {name}; use selectinload/joinedload")
+
+    event.listen(Session, "do_orm_execute", guard)
+    yield violations
+    event.remove(Session, "do_orm_execute", guard)
+    if violations and request.node.get_closest_marker("allow_lazy_loads") is None:
+        pytest.fail(f"Lazy relationship loads: {', '.join(violations)}")
@@ -0,0 +1,113 @@
+"""
+Admission Control Tests
+"""
+
+import asyncio
+
+
+def _controller(total=2, browse=1, timeout=0.2, max_queue=10):
+    from app.core.admission import AdmissionClass, AdmissionController
+
+    return AdmissionController(total, [
+        AdmissionClass("critical", total, timeout, max_queue),
+        AdmissionClass("default", total, timeout, max_queue),
+        AdmissionClass("browse", browse, timeout, max_queue),
+    ])
+
+
+class TestClassify:
+    """Route to priority class mapping"""
+
+    def test_routes(self):
+        from app.core.admission import classify
+
+        assert classify("POST", "/api/v2/bookings/") == "critical"
+        assert classify("POST", "/api/v2/payments/") == "critical"
+        assert classify("POST", "/api/v2/bookings/7/cancel") == "default"
+        assert classify("GET", "/api/v2/destinations/") == "browse"
+        assert classify("GET", "/api/v2/destinations/3/quote") == "browse"
+        assert classify("POST", "/api/v2/destinations/") == "default"
+        assert classify("GET", "/api/v2/destinations/3/availability/stream") is None
+        assert classify("GET", "/api/v2/health/admission") is None
+
+
+class TestAdmissionController:
+    """Slots, priority hand-off and queue deadlines"""
+
+    def test_freed_slot_goes_to_highest_priority_waiter(self):
+        controller = _controller(total=1, browse=1)
+        order = []
+
+        async def request(name, hold=0.0):
+            if await controller.acquire(name):
+                order.append(name)
+                await asyncio.sleep(hold)
+                controller.release(name)
+
+        async def scenario():
+            first = asyncio.create_task(request("browse", hold=0.05))
+            await asyncio.sleep(0)
+            waiting = [asyncio.create_task(request(name)) for name in ("browse", "default", "critical")]
+            await asyncio.gather(first, *waiting)
+
+        asyncio.run(scenario())
+        assert order == ["browse", "critical", "default", "browse"]
+        assert controller.in_flight == 0
+
+    def test_browse_cap_leaves_room_for_bookings(self):
+        controller = _controller(total=3, browse=1, timeout=0.01)
+
+        async def scenario():
+            assert await controller.acquire("browse")
+            second_browse = await controller.acquire("browse")
+            booking = await controller.acquire("critical")
+            return second_browse, booking
+
+        second_browse, booking = asyncio.run(scenario())
+        assert not second_browse and booking
+        assert controller.metrics()["classes"]["browse"]["rejected"] == 1
+
+    def test_full_queue_is_shed_without_waiting(self):
+        controller = _controller(total=1, timeout=10, max_queue=0)
+
+        async def scenario():
+            await controller.acquire("default")
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            admitted = await controller.acquire("default")
+            return admitted, loop.time() - started
+
+        admitted, waited = asyncio.run(scenario())
+        assert not admitted and waited < 0.01
+
+
+class TestAdmissionMiddleware:
+    """Fast 503s under overload"""
+
+    def test_overload_gets_503_with_retry_after(self):
+        import httpx
+        from app.core.admission import AdmissionMiddleware
+
+        controller = _controller(total=1, timeout=0.05)
+
+        async def scenario():
+            gate = asyncio.Event()
+
+            async def slow_app(scope, receive, send):
+                await gate.wait()
+                await send({"type": "http.response.start", "status": 200, "headers": []})
+                await send({"type": "http.response.body", "body": b"ok"})
+
+            transport = httpx.ASGITransport(app=AdmissionMiddleware(slow_app, controller))
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                holder = asyncio.create_task(client.post("/api/v2/bookings/"))
+                await asyncio.sleep(0.01)
+                shed = await client.get("/api/v2/destinations/")
+                gate.set()
+                return await holder, shed
+
+        held, shed = asyncio.run(scenario())
+        assert held.status_code == 200
+        assert shed.status_code == 503
+        assert shed.headers["retry-after"] == "1"
+        assert controller.in_flight == 0
@@ -0,0 +1,68 @@
+"""
+Batch Availability Endpoint Tests
+"""
+
+
+async def _seed():
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import Destination
+
+    async with AsyncSessionLocal() as db:
+        db.add(Destination(id=1, name="Lunar Gateway", code="LUNA-01", base_price_usd=1.0,
+                           max_capacity=10, current_availability=5))
+        db.add(Destination(id=2, name="Mars Base", code="MARS-01", base_price_usd=1.0,
+                           max_capacity=10, current_availability=1))
+        db.add(Destination(id=3, name="Orbital Hotel", code="ORB-01", base_price_usd=1.0))
+        await db.commit()
+
+
+class TestBatchAvailability:
+    """GET /destinations/availability"""
+
+    def test_one_query_for_many_destinations(self, run_async, api_client, statement_log):
+        async def scenario():
+            await _seed()
+            async with api_client() as client:
+                with statement_log() as log:
+                    response = await client.get("/api/v2/destinations/availability", params={
+                        "destination_id": [2, 1, 99, 3], "code": ["luna-01", "NOPE-01"], "passenger_count": 2
+                    })
+            return response, log
+
+        response, log = run_async(scenario)
+        assert response.status_code == 200
+        body = response.json()
+        assert [d["destination_id"] for d in body["destinations"]] == [2, 1, 3]
+        mars, luna, orbital = body["destinations"]
+        assert not mars["available"] and mars["waitlist_available"] is False
+        assert luna["available"] and luna["current_availability"] == 5
+        assert not orbital["available"]  # Not capacity-tracked: same answer as the single endpoint
+        assert body["not_found"] == [99, "NOPE-01"]
+        assert len(log.statements) == 1
+
+    def test_matches_single_endpoint(self, run_async, api_client):
+        async def scenario():
+            await _seed()
+            async with api_client() as client:
+                single = await client.get("/api/v2/destinations/1/availability", params={"passenger_count": 6})
+                batch = await client.get("/api/v2/destinations/availability",
+                                         params={"destination_id": 1, "passenger_count": 6})
+            return single, batch
+
+        single, batch = run_async(scenario)
+        assert batch.json()["destinations"] == [single.json()]
+
+    def test_requires_and_limits_items(self, run_async, api_client, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "AVAILABILITY_BATCH_MAX_ITEMS", 2)
+
+        async def scenario():
+            async with api_client() as client:
+                empty = await client.get("/api/v2/destinations/availability")
+                too_many = await client.get("/api/v2/destinations/availability", params={"destination_id": [1, 2, 3]})
+            return empty, too_many
+
+        empty, too_many = run_async(scenario)
+        assert empty.status_code == 400
+        assert too_many.status_code == 400
@@ -0,0 +1,73 @@
+"""
+Availability Hub Tests
+"""
+
+import asyncio
+import json
+
+
+def _payload(frame):
+    data_line = [line for line in frame.splitlines() if line.startswith("data: ")][0]
+    return json.loads(data_line[len("data: "):])
+
+
+class TestAvailabilityHub:
+    """Pub/sub behaviour behind the availability stream"""
+
+    def test_subscriber_receives_published_value(self):
+        from app.services.availability import AvailabilityHub
+
+        async def scenario():
+            hub = AvailabilityHub()
+            subscription = hub.subscribe(1)
+            waiter = asyncio.create_task(subscription.wait(timeout=1))
+            await asyncio.sleep(0)
+            hub.publish(1, 41)
+            return await waiter
+
+        frame = asyncio.run(scenario())
+        assert _payload(frame) == {"destination_id": 1, "current_availability": 41}
+
+    def test_bursts_are_coalesced_to_latest_value(self):
+        from app.services.availability import AvailabilityHub
+
+        async def scenario():
+            hub = AvailabilityHub()
+            subscription = hub.subscribe(1)
+            for remaining in (10, 9, 8, 7):
+                hub.publish(1, remaining)
+            first = await subscription.wait(timeout=1)
+            second = await subscription.wait(timeout=0.01)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert _payload(first)["current_availability"] == 7
+        assert second is None  # Nothing newer: heartbeat timeout
+
+    def test_fan_out_to_many_subscribers(self):
+        from app.services.availability import AvailabilityHub
+
+        async def scenario():
+            hub = AvailabilityHub()
+            subscriptions = [hub.subscribe(1) for _ in range(2000)]
+            waiters = [asyncio.create_task(s.wait(timeout=1)) for s in subscriptions]
+            await asyncio.sleep(0)
+            hub.publish(1, 3)
+            return await asyncio.gather(*waiters)
+
+        frames = asyncio.run(scenario())
+        assert len(set(frames)) == 1  # Encoded once, shared by all subscribers
+        assert _payload(frames[0])["current_availability"] == 3
+
+    def test_channel_released_when_last_subscriber_leaves(self):
+        from app.services.availability import AvailabilityHub
+
+        hub = AvailabilityHub()
+        first, second = hub.subscribe(5), hub.subscribe(5)
+        assert hub.subscriber_count(5) == 2
+        first.close()
+        first.close()
+        assert hub.subscriber_count(5) == 1
+        second.close()
+        assert hub.subscriber_count(5) == 0
+        hub.publish(5, 1)  # No channel, no-op
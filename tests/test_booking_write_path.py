@@ -0,0 +1,242 @@
+"""
+create_booking Write Path Tests
+"""
+
+BOOKING_PARAMS = {"user_id": 1, "destination_id": 1, "departure_date": "2031-01-15T09:00:00", "passenger_count": 2}
+
+
+class TestCreateBookingWritePath:
+    """Round-trip budget and inventory semantics"""
+
+    def test_round_trip_budget(self, run_async, api_client, seed_catalog, statement_log):
+        async def scenario():
+            await seed_catalog()
+            async with api_client() as client:
+                with statement_log() as log:
+                    response = await client.post("/api/v2/bookings/", params=BOOKING_PARAMS)
+            return response, log
+
+        response, log = run_async(scenario)
+        assert response.status_code == 200
+        # UPDATE destinations ... RETURNING, INSERT bookings, INSERT outbox; one transaction
+        assert log.verbs == ["UPDATE", "INSERT", "INSERT"]
+        assert log.commits == 1
+
+    def test_decrements_inventory_and_writes_outbox(self, run_async, api_client, seed_catalog):
+        from sqlalchemy import select
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import Destination, OutboxEvent
+        from app.services.notifications import OutboxRelay
+
+        async def scenario():
+            await seed_catalog()
+            async with api_client() as client:
+                response = await client.post("/api/v2/bookings/", params=BOOKING_PARAMS)
+            async with AsyncSessionLocal() as db:
+                availability = (await db.get(Destination, 1)).current_availability
+                topics = (await db.execute(select(OutboxEvent.topic))).scalars().all()
+            delivered = await OutboxRelay().run_once()
+            redelivered = await OutboxRelay().run_once()
+            return response, availability, topics, delivered, redelivered
+
+        response, availability, topics, delivered, redelivered = run_async(scenario)
+        assert response.json()["reference_code"].startswith("SP-")
+        assert availability == 8
+        assert topics == ["booking.created"]
+        assert (delivered, redelivered) == (1, 0)
+
+    def test_failed_delivery_backs_off_then_retries(self, run_async, api_client, monkeypatch, seed_catalog):
+        from datetime import datetime
+        from sqlalchemy import select, update
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import OutboxEvent
+        from app.services import notifications
+
+        async def failing_send(*args, **kwargs):
+            return False
+
+        async def scenario():
+            await seed_catalog()
+            async with api_client() as client:
+                await client.post("/api/v2/bookings/", params=BOOKING_PARAMS)
+            with monkeypatch.context() as patched:
+                patched.setattr(notifications._notification_service, "send_email", failing_send)
+                failed = await notifications.OutboxRelay().run_once()
+            async with AsyncSessionLocal() as db:
+                event = (await db.execute(select(OutboxEvent))).scalar_one()
+            backing_off = await notifications.OutboxRelay().run_once()
+            async with AsyncSessionLocal() as db:
+                await db.execute(update(OutboxEvent).values(next_attempt_at=datetime.utcnow()))
+                await db.commit()
+            retried = await notifications.OutboxRelay().run_once()
+            return failed, event, backing_off, retried
+
+        failed, event, backing_off, retried = run_async(scenario)
+        assert failed == 0
+        assert event.published_at is None and event.attempts == 1
+        assert event.next_attempt_at > datetime.utcnow()
+        assert backing_off == 0
+        assert retried == 1
+
+    def test_sold_out_and_missing_destination(self, run_async, api_client, seed_catalog):
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import Destination
+
+        async def scenario():
+            await seed_catalog(current_availability=0)
+            async with api_client() as client:
+                sold_out = await client.post("/api/v2/bookings/", params=BOOKING_PARAMS)
+                missing = await client.post("/api/v2/bookings/", params={**BOOKING_PARAMS, "destination_id": 99})
+            async with AsyncSessionLocal() as db:
+                availability = (await db.get(Destination, 1)).current_availability
+            return sold_out, missing, availability
+
+        sold_out, missing, availability = run_async(scenario)
+        assert sold_out.status_code == 400
+        assert missing.status_code == 404
+        assert availability == 0
+
+
+class TestOutboxRelayFailures:
+    """Per-event failure handling: no batch rollback, no head-of-line blocking, dead letters"""
+
+    @staticmethod
+    async def _events(*payloads):
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import OutboxEvent
+
+        async with AsyncSessionLocal() as db:
+            db.add_all([OutboxEvent(topic="booking.created", payload=payload) for payload in payloads])
+            await db.commit()
+
+    @staticmethod
+    def _recording_sender(monkeypatch, fail_for=()):
+        from app.services import notifications
+
+        sent = []
+
+        async def send_email(to_email, subject, body):
+            sent.append(body)
+            return not any(code in body for code in fail_for)
+
+        monkeypatch.setattr(notifications._notification_service, "send_email", send_email)
+        return sent
+
+    def test_poison_payload_does_not_resend_the_batch(self, run_async, monkeypatch):
+        from sqlalchemy import select
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import OutboxEvent
+        from app.services.notifications import OutboxRelay
+
+        sent = self._recording_sender(monkeypatch)
+
+        async def scenario():
+            await self._events('{"reference_code": "SP-1"}', "not json", "{}", '{"reference_code": "SP-2"}')
+            passes = [await OutboxRelay().run_once(), await OutboxRelay().run_once()]
+            async with AsyncSessionLocal() as db:
+                published = (await db.execute(
+                    select(OutboxEvent.id).where(OutboxEvent.published_at.isnot(None)).order_by(OutboxEvent.id)
+                )).scalars().all()
+            return passes, published
+
+        passes, published = run_async(scenario)
+        assert passes == [2, 0]
+        assert published == [1, 4]
+        assert len(sent) == 2  # Each good event sent exactly once
+
+    def test_failing_events_do_not_block_newer_ones(self, run_async, monkeypatch):
+        from app.core.config import settings
+        from app.services.notifications import OutboxRelay
+
+        monkeypatch.setattr(settings, "OUTBOX_BATCH_SIZE", 2)
+        sent = self._recording_sender(monkeypatch, fail_for=("SP-1", "SP-2"))
+
+        async def scenario():
+            await self._events(*(f'{{"reference_code": "SP-{n}"}}' for n in range(1, 5)))
+            return [await OutboxRelay().run_once() for _ in range(3)]
+
+        assert run_async(scenario) == [0, 2, 0]
+        assert sent == [f"Your booking SP-{n} has been confirmed." for n in range(1, 5)]
+
+    def test_dead_letter_after_max_attempts(self, run_async, monkeypatch):
+        from sqlalchemy import select, update
+        from app.core.config import settings
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import OutboxEvent
+        from app.services.notifications import OutboxRelay
+
+        monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 3)
+        sent = self._recording_sender(monkeypatch, fail_for=("SP-1",))
+
+        async def scenario():
+            await self._events('{"reference_code": "SP-1"}')
+            for _ in range(5):
+                await OutboxRelay().run_once()
+                async with AsyncSessionLocal() as db:  # Skip the backoff
+                    await db.execute(update(OutboxEvent).values(next_attempt_at=None))
+                    await db.commit()
+            async with AsyncSessionLocal() as db:
+                return (await db.execute(select(OutboxEvent))).scalar_one()
+
+        event = run_async(scenario)
+        assert len(sent) == 3
+        assert event.attempts == 3
+        assert event.failed_at is not None and event.published_at is None
+
+
+class TestInventoryUnderConcurrency:
+    """Small run of the soak harness (benchmarks/soak_inventory.py)"""
+
+    def test_concurrent_bookings_and_cancels_keep_inventory_consistent(self, run_async, api_client):
+        from benchmarks.soak_inventory import seed, soak
+
+        async def scenario():
+            await seed(capacity=40)
+            async with api_client() as client:
+                return await soak(client, requests=300, concurrency=30, capacity=40, cancel_ratio=0.5)
+
+        result = run_async(scenario)
+        assert result.violations == []
+        assert result.errors == 0
+        assert result.statuses[("cancel", 200)] > 0
+        assert result.statuses[("book", 400)] > 0  # Sold out at some point
+
+    def test_cancel_twice(self, run_async, api_client, seed_catalog):
+        async def scenario():
+            await seed_catalog()
+            async with api_client() as client:
+                booking = (await client.post("/api/v2/bookings/", params=BOOKING_PARAMS)).json()
+                first = await client.post(f"/api/v2/bookings/{booking['id']}/cancel")
+                second = await client.post(f"/api/v2/bookings/{booking['id']}/cancel")
+                missing = await client.post("/api/v2/bookings/999/cancel")
+                destination = (await client.get("/api/v2/destinations/1")).json()
+            return first, second, missing, destination
+
+        first, second, missing, destination = run_async(scenario)
+        assert first.status_code == 200 and "refund_amount" in first.json()
+        assert second.status_code == 400
+        assert missing.status_code == 404
+        assert destination["current_availability"] == 10
+
+    def test_completed_and_refunded_bookings_are_not_cancellable(self, run_async, api_client, seed_catalog):
+        from sqlalchemy import update
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import Booking, BookingStatus
+
+        async def scenario():
+            await seed_catalog()
+            responses = {}
+            async with api_client() as client:
+                for status in (BookingStatus.COMPLETED, BookingStatus.REFUNDED):
+                    booking = (await client.post("/api/v2/bookings/", params=BOOKING_PARAMS)).json()
+                    async with AsyncSessionLocal() as db:
+                        await db.execute(update(Booking).where(Booking.id == booking["id"]).values(status=status))
+                        await db.commit()
+                    responses[status] = await client.post(f"/api/v2/bookings/{booking['id']}/cancel")
+                destination = (await client.get("/api/v2/destinations/1")).json()
+            return responses, destination
+
+        responses, destination = run_async(scenario)
+        assert [r.status_code for r in responses.values()] == [400, 400]
+        assert "completed" in responses[BookingStatus.COMPLETED].json()["detail"]
+        assert destination["current_availability"] == 6  # Two bookings of 2, no seats released
@@ -0,0 +1,85 @@
+"""
+Finance Export Tests
+"""
+
+import csv
+import io
+from datetime import datetime
+
+import pytest
+
+
+async def _seed():
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import Booking, BookingStatus, Destination, User
+
+    async with AsyncSessionLocal() as db:
+        db.add(User(id=1, email="finance@example.com", hashed_password="x"))
+        db.add(Destination(id=1, name="Moon Base", code="MOON-01", base_price_usd=1000.0))
+        db.add(Destination(id=2, name="Mars Base", code="MARS-01", base_price_usd=9000.0))
+        for n in range(25):
+            db.add(Booking(
+                reference_code=f"SP-EX{n:04d}", user_id=1, destination_id=1 + n % 2,
+                created_at=datetime(2030, 1 + n % 3, 10), departure_date=datetime(2031, 1, 1),
+                passenger_count=1, total_price=1000.0 + n, discount_applied=0.0,
+                status=BookingStatus.REFUNDED if n == 0 else BookingStatus.CONFIRMED
+            ))
+        await db.commit()
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 4)
+
+
+@pytest.fixture
+def export(run_async, api_client, admin_headers):
+    def request(params):
+        async def scenario():
+            await _seed()
+            async with api_client() as client:
+                return await client.get("/api/v2/exports/bookings", params=params, headers=admin_headers)
+        return run_async(scenario)
+    return request
+
+
+class TestBookingsExport:
+    """Streaming CSV / Arrow / Parquet export"""
+
+    def test_csv_with_date_range_and_destination_filter(self, export):
+        response = export({
+            "start": "2030-01-01T00:00:00", "end": "2030-02-01T00:00:00", "destination_id": [1]
+        })
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        # January bookings are n % 3 == 0; destination 1 is n % 2 == 0
+        assert [row["reference_code"] for row in rows] == [f"SP-EX{n:04d}" for n in (0, 6, 12, 18, 24)]
+        assert rows[0]["status"] == "refunded"
+        assert rows[0]["user_email"] == "finance@example.com"
+        assert rows[0]["destination_code"] == "MOON-01"
+
+    def test_arrow_stream_round_trips(self, export):
+        pytest.importorskip("pyarrow")
+        import pyarrow.ipc
+
+        response = export({"format": "arrow"})
+        table = pyarrow.ipc.open_stream(response.content).read_all()
+        assert table.num_rows == 25
+        assert table.column("total_price").to_pylist()[:2] == [1000.0, 1001.0]
+
+    def test_parquet_round_trips(self, export):
+        pytest.importorskip("pyarrow")
+        import pyarrow.parquet
+
+        response = export({"format": "parquet", "destination_id": [2]})
+        table = pyarrow.parquet.read_table(io.BytesIO(response.content))
+        assert table.num_rows == 12
+        assert set(table.column("destination_code").to_pylist()) == {"MARS-01"}
+
+    def test_requires_admin_token(self, run_async, api_client, admin_headers):
+        async def scenario():
+            async with api_client() as client:
+                return await client.get("/api/v2/exports/bookings")  # Admin API enabled, headers not sent
+        assert run_async(scenario).status_code == 403
@@ -0,0 +1,151 @@
+"""
+Multi-currency Fare Table Tests
+"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def fresh_fare_table():
+    from app.services.fares import fare_service
+
+    # The schema is recreated per test but catalog_epoch is not
+    fare_service.invalidate()
+    yield
+    fare_service.invalidate()
+
+
+async def _seed():
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import Destination, ExchangeRate
+
+    async with AsyncSessionLocal() as db:
+        db.add(Destination(id=1, name="Lunar Gateway", code="LUNA-01", base_price_usd=12_345.67))
+        db.add(Destination(id=2, name="Mars Base", code="MARS-01", base_price_usd=100_000.0))
+        db.add(ExchangeRate(currency="EUR", units_per_usd=0.9))
+        db.add(ExchangeRate(currency="JPY", units_per_usd=150.0))
+        await db.commit()
+
+
+class TestFareTable:
+    """Precomputed prices per currency, rebuilt on catalog changes"""
+
+    def test_prices_rounded_to_currency_minor_units(self, run_async):
+        from app.services.fares import fare_service
+
+        async def scenario():
+            await _seed()
+            return await fare_service.table()
+
+        table = run_async(scenario)
+        assert table.rates == {"USD": 1.0, "EUR": 0.9, "JPY": 150.0}  # no GBP rate: not quoted
+        assert table.price(1, "USD") == 12_345.67
+        assert table.price(1, "EUR") == 11_111.1
+        assert table.price(1, "JPY") == 1_851_850
+        assert table.price(99, "EUR") is None
+
+    def test_rates_file_overrides_table(self, run_async, monkeypatch, tmp_path):
+        from app.core.config import settings
+        from app.services.fares import fare_service
+
+        rates_file = tmp_path / "rates.json"
+        rates_file.write_text(json.dumps({"GBP": 0.8, "EUR": 0.95}))
+        monkeypatch.setattr(settings, "EXCHANGE_RATES_FILE", str(rates_file))
+
+        async def scenario():
+            await _seed()
+            return await fare_service.table()
+
+        assert run_async(scenario).rates == {"USD": 1.0, "EUR": 0.95, "GBP": 0.8}
+
+    def test_rate_update_rebuilds_table(self, run_async, api_client, admin_headers):
+        async def scenario():
+            await _seed()
+            async with api_client() as client:
+                before = await client.get("/api/v2/destinations/2/quote", params={
+                    "currency": "EUR", "departure_date": "2031-01-15T09:00:00"
+                })
+                updated = await client.put("/api/v2/admin/exchange-rates", json={"EUR": 0.5}, headers=admin_headers)
+                after = await client.get("/api/v2/destinations/2/quote", params={
+                    "currency": "EUR", "departure_date": "2031-01-15T09:00:00"
+                })
+            return before, updated, after
+
+        before, updated, after = run_async(scenario)
+        assert updated.status_code == 200
+        assert updated.json()["rates"]["EUR"] == 0.5
+        assert before.json()["base_price"] == 90_000.0
+        assert after.json()["base_price"] == 50_000.0
+
+    def test_rate_update_rejects_unsupported_currencies(self, run_async, api_client, admin_headers):
+        from app.services.fares import fare_service
+
+        async def scenario():
+            await _seed()
+            async with api_client() as client:
+                unsupported = await client.put("/api/v2/admin/exchange-rates", json={"EUR": 0.5, "XYZ": 2.0}, headers=admin_headers)
+                negative = await client.put("/api/v2/admin/exchange-rates", json={"GBP": -1.0}, headers=admin_headers)
+            return unsupported, negative, await fare_service.table()
+
+        unsupported, negative, table = run_async(scenario)
+        assert unsupported.status_code == 400
+        assert "XYZ" in unsupported.json()["detail"]
+        assert negative.status_code == 400
+        assert table.rates == {"USD": 1.0, "EUR": 0.9, "JPY": 150.0}  # Nothing from either request was stored
+
+
+class TestCurrencyEndpoints:
+    """Listing and quoting in non-USD currencies"""
+
+    def test_quote_hits_no_database(self, run_async, api_client, statement_log):
+        from app.services.fares import fare_service
+
+        async def scenario():
+            await _seed()
+            await fare_service.table()
+            async with api_client() as client:
+                with statement_log() as log:
+                    response = await client.get("/api/v2/destinations/2/quote", params={
+                        "currency": "jpy", "passenger_count": 2, "departure_date": "2031-01-15T09:00:00"
+                    })
+            return response, log
+
+        response, log = run_async(scenario)
+        quote = response.json()
+        assert log.statements == []
+        assert quote["currency"] == "JPY"
+        assert quote["base_price"] == 15_000_000
+        assert quote["subtotal"] == 30_000_000
+        assert quote["insurance_fee_per_passenger"] == 75_000
+
+    def test_unsupported_currency_and_unknown_destination(self, run_async, api_client):
+        async def scenario():
+            await _seed()
+            async with api_client() as client:
+                gbp = await client.get("/api/v2/destinations/", params={"currency": "GBP"})
+                missing = await client.get("/api/v2/destinations/99/quote", params={
+                    "departure_date": "2031-01-15T09:00:00"
+                })
+            return gbp, missing
+
+        gbp, missing = run_async(scenario)
+        assert gbp.status_code == 400
+        assert missing.status_code == 404
+
+    def test_list_in_currency_includes_new_destinations(self, run_async, api_client):
+        async def scenario():
+            await _seed()
+            async with api_client() as client:
+                await client.get("/api/v2/destinations/", params={"currency": "EUR"})
+                await client.post("/api/v2/destinations/", params={
+                    "name": "Europa Station", "code": "EUR-01", "base_price_usd": 200_000.0,
+                    "distance_km": 628_300_000, "travel_duration_hours": 9000
+                })
+                return await client.get("/api/v2/destinations/", params={"currency": "EUR"})
+
+        listed = {d["code"]: d for d in run_async(scenario).json()}
+        assert listed["EUR-01"]["base_price"] == 180_000.0
+        assert listed["LUNA-01"]["base_price_usd"] == 12_345.67
+        assert all(d["currency"] == "EUR" for d in listed.values())
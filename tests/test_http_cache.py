@@ -0,0 +1,147 @@
+"""
+Catalog Conditional GET and Compression Tests
+"""
+
+import gzip
+from email.utils import formatdate
+
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the time app.core.http_cache sees; starts after the last recorded change"""
+    from app.core import http_cache
+    from app.core.shared_state import shared_counters
+
+    class Clock:
+        now = shared_counters.get("catalog_modified_at") + 10
+
+        def time(self):
+            return self.now
+
+    fake = Clock()
+    monkeypatch.setattr(http_cache, "time", fake)
+    return fake
+
+
+class TestConditionalGet:
+    """ETag / Last-Modified validators on catalog reads"""
+
+    def test_matching_etag_gets_304_without_a_query(self, run_async, api_client, seed_catalog, statement_log):
+        async def scenario():
+            await seed_catalog(destinations=20)
+            async with api_client() as client:
+                first = await client.get("/api/v2/destinations/1")
+                with statement_log() as log:
+                    revalidated = await client.get(
+                        "/api/v2/destinations/1", headers={"If-None-Match": first.headers["etag"]}
+                    )
+            return first, revalidated, log
+
+        first, revalidated, log = run_async(scenario)
+        assert first.headers["etag"].startswith('W/"')
+        assert "max-age=" in first.headers["cache-control"]
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["etag"] == first.headers["etag"]
+        assert log.statements == []
+
+    def test_booking_and_catalog_writes_change_validators(self, run_async, api_client, seed_catalog):
+        async def scenario():
+            await seed_catalog(destinations=20)
+            async with api_client() as client:
+                etags = [(await client.get("/api/v2/destinations/code/mars-01")).headers["etag"]]
+                await client.post("/api/v2/bookings/", params={
+                    "user_id": 1, "destination_id": 1, "departure_date": "2031-01-15T09:00:00"
+                })
+                etags.append((await client.get("/api/v2/destinations/code/mars-01")).headers["etag"])
+                await client.post("/api/v2/destinations/", params={
+                    "name": "Titan Dock", "code": "TTN-01", "base_price_usd": 5.0,
+                    "distance_km": 1.0, "travel_duration_hours": 1
+                })
+                stale = await client.get("/api/v2/destinations/", headers={"If-None-Match": etags[-1]})
+            return etags, stale
+
+        etags, stale = run_async(scenario)
+        assert etags[0] != etags[1] != stale.headers["etag"]
+        assert stale.status_code == 200
+
+    def test_if_modified_since(self, run_async, api_client, clock, seed_catalog):
+        async def scenario():
+            await seed_catalog()
+            async with api_client() as client:
+                first = await client.get("/api/v2/destinations/")
+                current = await client.get(
+                    "/api/v2/destinations/", headers={"If-Modified-Since": first.headers["last-modified"]}
+                )
+                old = await client.get(
+                    "/api/v2/destinations/", headers={"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+                )
+            return current, old
+
+        current, old = run_async(scenario)
+        assert current.status_code == 304
+        assert old.status_code == 200
+
+    def test_write_in_the_same_second_is_not_hidden_by_dates(self, run_async, api_client, clock, seed_catalog):
+        booking = {"user_id": 1, "destination_id": 1, "departure_date": "2031-01-15T09:00:00"}
+
+        async def scenario():
+            await seed_catalog()
+            async with api_client() as client:
+                await client.post("/api/v2/bookings/", params=booking)
+                during = await client.get("/api/v2/destinations/1")
+                await client.post("/api/v2/bookings/", params=booking)  # Same second
+                date_only = await client.get(
+                    "/api/v2/destinations/1", headers={"If-Modified-Since": formatdate(clock.now, usegmt=True)}
+                )
+                clock.now += 1
+                settled = await client.get("/api/v2/destinations/1")
+                revalidated = await client.get(
+                    "/api/v2/destinations/1", headers={"If-Modified-Since": settled.headers["last-modified"]}
+                )
+            return during, date_only, settled, revalidated
+
+        during, date_only, settled, revalidated = run_async(scenario)
+        assert "last-modified" not in during.headers
+        assert date_only.status_code == 200
+        assert date_only.json()["current_availability"] == 8
+        assert settled.headers["last-modified"] == formatdate(clock.now - 1, usegmt=True)
+        assert revalidated.status_code == 304
+
+
+class TestCompression:
+    """Negotiated compression above COMPRESSION_MINIMUM_SIZE"""
+
+    def test_large_list_is_gzipped(self, run_async, api_client, seed_catalog):
+        async def scenario():
+            await seed_catalog(destinations=20)
+            async with api_client() as client:
+                plain = await client.get("/api/v2/destinations/", headers={"Accept-Encoding": "identity"})
+                compressed = await client.get("/api/v2/destinations/", headers={"Accept-Encoding": "gzip"})
+            return plain, compressed
+
+        plain, compressed = run_async(scenario)
+        assert "content-encoding" not in plain.headers
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in compressed.headers["vary"]
+        assert int(compressed.headers["content-length"]) < len(plain.content) / 4
+        assert compressed.json() == plain.json()
+
+    def test_small_responses_are_not_compressed(self, run_async, api_client):
+        async def scenario():
+            async with api_client() as client:
+                return await client.get("/api/v2/health", headers={"Accept-Encoding": "gzip"})
+
+        response = run_async(scenario)
+        assert "content-encoding" not in response.headers
+
+    def test_negotiation(self):
+        from app.core import compression
+
+        assert compression.negotiate_encoding("gzip;q=0, deflate") is None
+        assert compression.negotiate_encoding("deflate, *;q=0.1") in ("br", "gzip")
+        assert gzip.decompress(compression.compress(b"x" * 2000, "gzip")) == b"x" * 2000
+        if compression.brotli is None:
+            assert compression.negotiate_encoding("br, gzip") == "gzip"
@@ -0,0 +1,123 @@
+"""
+Booking Lifecycle Scheduler Tests
+"""
+
+from datetime import datetime, timedelta
+
+NOW = datetime(2030, 6, 1, 12, 0)
+
+
+async def _seed(bookings):
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import Booking, Destination, User
+
+    async with AsyncSessionLocal() as db:
+        db.add(User(id=1, email="crew@example.com", hashed_password="x"))
+        db.add(Destination(id=1, name="Orbital One", code="ORB-01", base_price_usd=1000.0,
+                           max_capacity=20, current_availability=10))
+        for n, (status, created_at, departure_date, passengers) in enumerate(bookings):
+            db.add(Booking(
+                reference_code=f"SP-LC{n:04d}", user_id=1, destination_id=1, status=status,
+                created_at=created_at, departure_date=departure_date,
+                passenger_count=passengers, total_price=1000.0 * passengers
+            ))
+        await db.commit()
+
+
+async def _state():
+    from sqlalchemy import select
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import Booking, Destination
+
+    async with AsyncSessionLocal() as db:
+        statuses = (await db.execute(select(Booking.status).order_by(Booking.id))).scalars().all()
+        destination = await db.get(Destination, 1)
+        return statuses, destination.current_availability
+
+
+class TestBookingLifecycleScheduler:
+    """Set-based expiry and completion"""
+
+    def test_expires_stale_holds_and_completes_departures(self, run_async):
+        from app.models.models import BookingStatus as S
+        from app.services.lifecycle import BookingLifecycleScheduler
+
+        stale = NOW - timedelta(hours=2)
+        future = NOW + timedelta(days=60)
+
+        async def scenario():
+            await _seed([
+                (S.PENDING, stale, future, 2),                        # expires
+                (S.PENDING, NOW - timedelta(minutes=5), future, 1),   # still held
+                (S.CONFIRMED, stale, NOW - timedelta(days=1), 3),     # completes
+                (S.CONFIRMED, stale, future, 1),                      # upcoming
+            ])
+            scheduler = BookingLifecycleScheduler()
+            moved = await scheduler.run_once(now=NOW)
+            return moved, await _state(), scheduler.metrics()
+
+        moved, (statuses, availability), metrics = run_async(scenario)
+        assert moved == {"expired": 1, "completed": 1}
+        assert statuses == [S.CANCELLED, S.PENDING, S.COMPLETED, S.CONFIRMED]
+        assert availability == 12
+        assert metrics["expired_total"] == 1
+        assert metrics["completion_lag_seconds"] == 86400.0
+
+    def test_batches_are_limited_per_tick(self, run_async, monkeypatch):
+        from app.core.config import settings
+        from app.models.models import BookingStatus as S
+        from app.services.lifecycle import BookingLifecycleScheduler
+
+        monkeypatch.setattr(settings, "LIFECYCLE_BATCH_SIZE", 2)
+        monkeypatch.setattr(settings, "LIFECYCLE_MAX_BATCHES_PER_TICK", 2)
+        stale = NOW - timedelta(hours=2)
+
+        async def scenario():
+            await _seed([(S.PENDING, stale, NOW + timedelta(days=10), 1)] * 5)
+            scheduler = BookingLifecycleScheduler()
+            first = await scheduler.run_once(now=NOW)
+            second = await scheduler.run_once(now=NOW)
+            return first, second, await _state()
+
+        first, second, (statuses, availability) = run_async(scenario)
+        assert first["expired"] == 4
+        assert second["expired"] == 1
+        assert statuses == [S.CANCELLED] * 5
+        assert availability == 15
+
+
+class TestPaymentConfirmsBooking:
+    """process_payment takes the booking out of the unpaid-hold set"""
+
+    def test_paid_booking_survives_expiry(self, run_async, api_client):
+        from app.models.models import BookingStatus as S
+        from app.services.lifecycle import BookingLifecycleScheduler
+
+        async def scenario():
+            await _seed([])
+            async with api_client() as client:
+                paid = (await client.post("/api/v2/bookings/", params={
+                    "user_id": 1, "destination_id": 1, "departure_date": "2031-01-15T09:00:00"
+                })).json()
+                await client.post("/api/v2/bookings/", params={
+                    "user_id": 1, "destination_id": 1, "departure_date": "2031-01-15T09:00:00"
+                })
+                payment = await client.post("/api/v2/payments/", params={
+                    "booking_id": paid["id"], "amount": paid["total_price"], "payment_method": "credit_card"
+                })
+                repeat = await client.post("/api/v2/payments/", params={
+                    "booking_id": paid["id"], "amount": paid["total_price"], "payment_method": "credit_card"
+                })
+                missing = await client.post("/api/v2/payments/", params={
+                    "booking_id": 999, "amount": 1.0, "payment_method": "credit_card"
+                })
+            moved = await BookingLifecycleScheduler().run_once(now=datetime.utcnow() + timedelta(minutes=31))
+            return payment, repeat, missing, moved, await _state()
+
+        payment, repeat, missing, moved, (statuses, availability) = run_async(scenario)
+        assert payment.status_code == 200
+        assert repeat.status_code == 400
+        assert missing.status_code == 404
+        assert moved["expired"] == 1
+        assert statuses == [S.CONFIRMED, S.CANCELLED]
+        assert availability == 9
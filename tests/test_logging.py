@@ -0,0 +1,110 @@
+"""
+Logging Pipeline Tests
+"""
+
+import json
+import logging
+import queue
+
+
+def _record(name="app.test", level=logging.INFO, msg="booking %s", args=(42,)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+class TestLoggingPipeline:
+    """Queue handler, JSON output and sampling"""
+
+    def test_queue_handler_renders_message_in_caller(self):
+        from app.core.logging_config import NonBlockingQueueHandler, request_id_var
+
+        class Booking:
+            status = "pending"
+
+            def __repr__(self):
+                return f"<Booking {self.status}>"
+
+        booking = Booking()
+        handler = NonBlockingQueueHandler(queue.Queue())
+        token = request_id_var.set("req-1")
+        try:
+            handler.emit(_record(msg="saw %r", args=(booking,)))
+        finally:
+            request_id_var.reset(token)
+        booking.status = "confirmed"  # The event loop moves on before the listener runs
+
+        queued = handler.queue.get_nowait()
+        assert (queued.getMessage(), queued.args) == ("saw <Booking pending>", None)
+        assert queued.request_id == "req-1"
+
+    def test_traceback_is_rendered_before_enqueue(self):
+        import sys
+        from app.core.logging_config import JsonFormatter, NonBlockingQueueHandler
+
+        handler = NonBlockingQueueHandler(queue.Queue())
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            record = _record()
+            record.exc_info = sys.exc_info()
+            handler.emit(record)
+
+        queued = handler.queue.get_nowait()
+        assert queued.exc_info is None
+        assert "ZeroDivisionError" in json.loads(JsonFormatter().format(queued))["exc"]
+
+    def test_second_lifespan_restarts_the_listener(self, run_async):
+        from app.core import logging_config
+        from app.main import app
+
+        async def scenario():
+            async with app.router.lifespan_context(app):
+                pass
+            async with app.router.lifespan_context(app):
+                logging.getLogger("app.test").warning("logged during the second lifespan")
+            # Shutdown flushes, but only a running listener drains the queue
+            return logging_config._queue_handler.queue.qsize()
+
+        try:
+            assert run_async(scenario) == 0
+        finally:
+            logging_config.setup_logging()  # Leave it running for the rest of the suite
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        from app.core.logging_config import NonBlockingQueueHandler
+
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        before = NonBlockingQueueHandler.dropped
+        handler.emit(_record())
+        handler.emit(_record())
+        assert NonBlockingQueueHandler.dropped == before + 1
+
+    def test_json_formatter_includes_request_id_and_extras(self):
+        from app.core.logging_config import JsonFormatter
+
+        record = _record()
+        record.request_id = "req-2"
+        record.booking_ref = "SP-1234ABCD"
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["message"] == "booking 42"
+        assert entry["request_id"] == "req-2"
+        assert entry["booking_ref"] == "SP-1234ABCD"
+        assert entry["level"] == "INFO"
+
+    def test_sampling_only_applies_to_noisy_low_level_records(self):
+        from app.core.logging_config import SamplingFilter
+
+        never = SamplingFilter(["sqlalchemy.engine"], rate=0.0)
+        assert not never.filter(_record(name="sqlalchemy.engine.Engine"))
+        assert never.filter(_record(name="sqlalchemy.engine.Engine", level=logging.WARNING))
+        assert never.filter(_record(name="app.routers.bookings"))
+
+    def test_request_id_header_is_echoed(self, api_client, run_async):
+        async def scenario():
+            async with api_client() as client:
+                given = await client.get("/api/v2/health", headers={"X-Request-ID": "abc123"})
+                generated = await client.get("/api/v2/health")
+            return given, generated
+
+        given, generated = run_async(scenario)
+        assert given.headers["x-request-id"] == "abc123"
+        assert len(generated.headers["x-request-id"]) == 32
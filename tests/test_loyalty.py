@@ -0,0 +1,143 @@
+"""
+Loyalty Accrual Tests
+"""
+
+from datetime import datetime
+
+
+async def _seed(bookings_per_user, total_price=20_000.0, status=None):
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import Booking, BookingStatus, Destination, User
+
+    async with AsyncSessionLocal() as db:
+        db.add(Destination(name="Moon Base", code="MOON-01", base_price_usd=total_price))
+        for user_id, count in enumerate(bookings_per_user, start=1):
+            db.add(User(id=user_id, email=f"u{user_id}@example.com", hashed_password="x", loyalty_points=0))
+            for n in range(count):
+                db.add(Booking(
+                    reference_code=f"SP-{user_id:03d}{n:04d}", user_id=user_id, destination_id=1,
+                    departure_date=datetime(2024, 1, 1), passenger_count=1, total_price=total_price,
+                    status=status or BookingStatus.COMPLETED
+                ))
+        await db.commit()
+
+
+async def _users():
+    from sqlalchemy import select
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import User
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User.id, User.loyalty_points, User.loyalty_tier).order_by(User.id))
+        return [tuple(row) for row in result.all()]
+
+
+class TestLoyaltyAccrual:
+    """Chunked, checkpointed accrual job"""
+
+    def test_tier_thresholds(self):
+        from app.services.loyalty import LoyaltyService
+
+        service = LoyaltyService()
+        assert service.tier_for(0) == "bronze"
+        assert service.tier_for(50_000) == "silver"
+        assert service.tier_for(5_000_000) == "diamond"
+
+    def test_accrues_points_and_tiers_in_chunks(self, run_async):
+        from app.core.config import settings
+        from app.services.loyalty import LoyaltyService
+
+        async def scenario():
+            await _seed([3, 1])
+            processed = await LoyaltyService().run_accrual(chunk_size=2)
+            return processed, await _users()
+
+        processed, users = run_async(scenario)
+        per_booking = int(20_000 * settings.LOYALTY_POINTS_MULTIPLIER)
+        assert processed == 4
+        assert users[0][1] == 3 * per_booking
+        assert users[1][1] == per_booking
+        assert users[0][2] == LoyaltyService().tier_for(3 * per_booking)
+
+    def test_rerun_is_idempotent(self, run_async):
+        from app.services.loyalty import LoyaltyService
+
+        async def scenario():
+            await _seed([2])
+            await LoyaltyService().run_accrual(chunk_size=10)
+            before = await _users()
+            again = await LoyaltyService().run_accrual(chunk_size=10)
+            return before, again, await _users()
+
+        before, again, after = run_async(scenario)
+        assert again == 0
+        assert before == after
+
+    def test_resumes_from_checkpoint_after_interruption(self, run_async):
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import JobCheckpoint
+        from app.services.loyalty import CHECKPOINT_NAME, LoyaltyService
+
+        async def scenario():
+            await _seed([5])
+            first = await LoyaltyService().run_accrual(chunk_size=2, max_chunks=1)
+            async with AsyncSessionLocal() as db:
+                position = (await db.get(JobCheckpoint, CHECKPOINT_NAME)).position
+            rest = await LoyaltyService().run_accrual(chunk_size=2)
+            return first, position, rest
+
+        first, position, rest = run_async(scenario)
+        assert (first, position, rest) == (2, 2, 3)
+
+    def test_ignores_bookings_that_are_not_completed(self, run_async):
+        from app.models.models import BookingStatus
+        from app.services.loyalty import LoyaltyService
+
+        async def scenario():
+            await _seed([2], status=BookingStatus.CONFIRMED)
+            return await LoyaltyService().run_accrual(), await _users()
+
+        processed, users = run_async(scenario)
+        assert processed == 0
+        assert users[0][1] == 0
+
+    def test_checkpoint_only_advances_and_late_completions_are_accrued(self, run_async):
+        from sqlalchemy import update
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import Booking, BookingStatus, JobCheckpoint
+        from app.services.loyalty import CHECKPOINT_NAME, LoyaltyService
+
+        async def position():
+            async with AsyncSessionLocal() as db:
+                return (await db.get(JobCheckpoint, CHECKPOINT_NAME)).position
+
+        async def scenario():
+            await _seed([3])
+            async with AsyncSessionLocal() as db:
+                await db.execute(update(Booking).where(Booking.id == 1).values(status=BookingStatus.CONFIRMED))
+                await db.commit()
+            first = await LoyaltyService().run_accrual(chunk_size=10)
+            caught_up = await position()
+            async with AsyncSessionLocal() as db:  # Booking 1 completes after the walk passed it
+                await db.execute(update(Booking).where(Booking.id == 1).values(status=BookingStatus.COMPLETED))
+                await db.commit()
+            late = await LoyaltyService().run_accrual(chunk_size=10)
+            return first, caught_up, late, await position()
+
+        assert run_async(scenario) == (2, 3, 1, 3)
+
+    def test_concurrent_first_runs_share_one_checkpoint(self, run_async):
+        import asyncio
+        from sqlalchemy import func, select
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import JobCheckpoint
+        from app.services.loyalty import LoyaltyService
+
+        async def scenario():
+            await _seed([4])
+            processed = await asyncio.gather(*(LoyaltyService().run_accrual(chunk_size=2) for _ in range(2)))
+            async with AsyncSessionLocal() as db:
+                checkpoints = (await db.execute(select(func.count()).select_from(JobCheckpoint))).scalar()
+            return sum(processed), checkpoints
+
+        assert run_async(scenario) == (4, 1)
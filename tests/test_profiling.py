@@ -0,0 +1,95 @@
+"""
+Request Profiler Tests
+"""
+
+import time
+
+
+class TestRequestProfiler:
+    """Opt-in profiling and admin downloads"""
+
+    def test_admin_endpoints_disabled_without_token(self, run_async, api_client):
+        async def scenario():
+            async with api_client() as client:
+                return await client.get("/api/v2/admin/profiling", headers={"X-Admin-Token": "s3cret"})
+
+        assert run_async(scenario).status_code == 404
+
+    def test_profile_header_captures_phases_and_stacks(self, run_async, api_client, seed_catalog, admin_headers):
+        from app.core.profiling import profiler
+
+        profiler.reset()
+
+        async def scenario():
+            await seed_catalog()
+            async with api_client() as client:
+                booking = await client.post(
+                    "/api/v2/bookings/",
+                    params={"user_id": 1, "destination_id": 1, "departure_date": "2031-01-15T09:00:00"},
+                    headers={"X-Profile": admin_headers["X-Admin-Token"]}
+                )
+                unsampled = await client.get("/api/v2/destinations/")
+                wrong_token = await client.get("/api/v2/admin/profiling", headers={"X-Admin-Token": "nope"})
+                summary = await client.get("/api/v2/admin/profiling", headers=admin_headers)
+                svg = await client.get("/api/v2/admin/profiling/flamegraph.svg", headers=admin_headers)
+            return booking, unsampled, wrong_token, summary, svg
+
+        booking, unsampled, wrong_token, summary, svg = run_async(scenario)
+        assert booking.status_code == 200 and unsampled.status_code == 200
+        assert wrong_token.status_code == 403
+
+        routes = summary.json()["routes"]
+        assert list(routes) == ["POST /api/v2/bookings/"]
+        phases = routes["POST /api/v2/bookings/"]["mean_ms"]
+        assert phases["db"] > 0
+        assert phases["pricing"] > 0
+        assert phases["total"] >= phases["endpoint"] >= phases["db"]
+        assert svg.headers["content-type"] == "image/svg+xml"
+        assert svg.text.startswith("<svg")
+
+    def test_non_ascii_tokens_are_rejected_not_errors(self, run_async, api_client, admin_headers):
+        async def scenario():
+            async with api_client() as client:
+                profiled = await client.get("/api/v2/health", headers={"X-Profile": "é".encode()})
+                admin = await client.get("/api/v2/admin/profiling", headers={"X-Admin-Token": "é".encode()})
+            return profiled, admin
+
+        profiled, admin = run_async(scenario)
+        assert profiled.status_code == 200
+        assert admin.status_code == 403
+
+    def test_sampler_collects_collapsed_stacks(self):
+        from app.core.profiling import RequestProfiler
+
+        profiler = RequestProfiler()
+        profiler.interval = 0.001
+        profiler.begin()
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            sum(range(1000))
+        profiler.end("GET /busy", {"total": 0.05})
+
+        collapsed = profiler.collapsed()
+        assert "test_sampler_collects_collapsed_stacks" in collapsed
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.splitlines())
+        assert profiler.summary()["routes"]["GET /busy"]["count"] == 1
+
+    def test_sample_rate_can_be_changed_at_runtime(self, run_async, api_client, admin_headers):
+        from app.core.profiling import profiler
+        from app.core.shared_state import shared_counters
+
+        profiler.reset()
+
+        async def scenario():
+            async with api_client() as client:
+                updated = await client.put("/api/v2/admin/profiling", params={"sample_rate": 1.0}, headers=admin_headers)
+                shared = shared_counters.get("profiling_sample_ppm")
+                await client.get("/api/v2/health")
+                await client.put("/api/v2/admin/profiling", params={"sample_rate": 0.0}, headers=admin_headers)
+            return updated, shared
+
+        updated, shared = run_async(scenario)
+        assert updated.json()["sample_rate"] == 1.0
+        assert shared == 1_000_000  # Every worker reads the rate from here
+        assert "GET /api/v2/health" in profiler.summary()["routes"]
+        assert profiler.sample_rate == 0.0
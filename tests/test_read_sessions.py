@@ -0,0 +1,99 @@
+"""
+Read-only session tests (get_read_db)
+"""
+
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def connections_at_serialization(monkeypatch):
+    """Pooled connections checked out each time a route result is serialized"""
+    import fastapi.routing
+    from app.core.database import engine
+
+    held = {"now": 0}
+    checked_out = []
+    original = fastapi.routing.jsonable_encoder
+
+    def on_checkout(*args):
+        held["now"] += 1
+
+    def on_checkin(*args):
+        held["now"] -= 1
+
+    def recording_encoder(obj, *args, **kwargs):
+        checked_out.append(held["now"])
+        return original(obj, *args, **kwargs)
+
+    monkeypatch.setattr(fastapi.routing, "jsonable_encoder", recording_encoder)
+    event.listen(engine.sync_engine, "checkout", on_checkout)
+    event.listen(engine.sync_engine, "checkin", on_checkin)
+    yield checked_out
+    event.remove(engine.sync_engine, "checkout", on_checkout)
+    event.remove(engine.sync_engine, "checkin", on_checkin)
+
+
+def _seed_destinations(count=3):
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import Destination
+
+    async def seed():
+        async with AsyncSessionLocal() as db:
+            for i in range(count):
+                db.add(Destination(
+                    name=f"Station {i}", code=f"ST-{i:02d}", base_price_usd=1000.0 + i,
+                    max_capacity=10, current_availability=10, is_active=True
+                ))
+            await db.commit()
+    return seed
+
+
+class TestReadOnlySessions:
+    """GET routes should not pay for transactions"""
+
+    def test_get_routes_issue_no_commit(self, run_async, api_client, statement_log):
+        async def scenario():
+            await _seed_destinations()()
+            async with api_client() as client:
+                with statement_log() as log:
+                    responses = [
+                        await client.get("/api/v2/destinations/"),
+                        await client.get("/api/v2/destinations/1"),
+                        await client.get("/api/v2/destinations/code/st-01"),
+                        await client.get("/api/v2/destinations/1/availability?passenger_count=2"),
+                    ]
+            return responses, log
+
+        responses, log = run_async(scenario)
+        assert [r.status_code for r in responses] == [200, 200, 200, 200]
+        assert len(responses[0].json()) == 3
+        assert log.commits == 0
+
+    def test_list_releases_connection_before_serialization(self, run_async, api_client,
+                                                           connections_at_serialization):
+        async def scenario():
+            await _seed_destinations()()
+            async with api_client() as client:
+                return await client.get("/api/v2/destinations/")
+
+        response = run_async(scenario)
+        assert response.status_code == 200
+        assert connections_at_serialization and connections_at_serialization[0] == 0
+
+    def test_single_object_gets_release_connection_before_serialization(self, run_async, api_client, seed_catalog,
+                                                                        connections_at_serialization):
+        async def scenario():
+            await seed_catalog(destinations=3)
+            async with api_client() as client:
+                return [
+                    await client.get("/api/v2/destinations/1"),
+                    await client.get("/api/v2/destinations/code/mars-01"),
+                    await client.get("/api/v2/destinations/1/availability?passenger_count=2"),
+                    await client.get("/api/v2/users/1"),
+                    await client.get("/api/v2/bookings/1"),  # 404 path
+                ]
+
+        responses = run_async(scenario)
+        assert [r.status_code for r in responses] == [200, 200, 200, 200, 404]
+        assert connections_at_serialization == [0, 0, 0, 0]
@@ -0,0 +1,144 @@
+"""
+Refresh Token Tests
+"""
+
+LOGIN = {"email": "pilot@example.com", "password": "hunter2"}
+
+
+async def _login(client):
+    return (await client.post("/api/v2/users/login", params=LOGIN)).json()
+
+
+async def _refresh(client, token):
+    return await client.post("/api/v2/users/token/refresh", json={"refresh_token": token})
+
+
+class TestRefreshTokens:
+    """Rotation, reuse detection and revocation"""
+
+    def test_login_issues_hashed_refresh_token(self, run_async, api_client, seed_catalog):
+        from sqlalchemy import select
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import RefreshToken
+
+        async def scenario():
+            await seed_catalog(password=LOGIN["password"])
+            async with api_client() as client:
+                tokens = await _login(client)
+            async with AsyncSessionLocal() as db:
+                stored = (await db.execute(select(RefreshToken))).scalars().all()
+            return tokens, stored
+
+        tokens, stored = run_async(scenario)
+        assert tokens["refresh_token"] and 7 * 86400 - 5 <= tokens["refresh_expires_in"] <= 7 * 86400
+        assert len(stored) == 1
+        assert stored[0].token_hash != tokens["refresh_token"]
+        assert len(stored[0].token_hash) == 64
+
+    def test_refresh_rotates_without_password_check(self, run_async, api_client, monkeypatch, seed_catalog,
+                                                    statement_log):
+        from app.routers import users
+
+        async def scenario():
+            await seed_catalog(password=LOGIN["password"])
+            async with api_client() as client:
+                tokens = await _login(client)
+                monkeypatch.setattr(users, "verify_password", lambda *args: 1 / 0)
+                with statement_log() as log:
+                    refreshed = await _refresh(client, tokens["refresh_token"])
+                me = await client.get("/api/v2/users/me",
+                                      headers={"Authorization": f"Bearer {refreshed.json()['access_token']}"})
+                again = await _refresh(client, refreshed.json()["refresh_token"])
+            return tokens, refreshed, me, again, log
+
+        tokens, refreshed, me, again, log = run_async(scenario)
+        assert refreshed.status_code == 200
+        assert refreshed.json()["refresh_token"] != tokens["refresh_token"]
+        assert log.verbs == ["UPDATE", "INSERT"]
+        assert me.status_code == 200 and me.json()["id"] == 1
+        assert again.status_code == 200
+
+    def test_reuse_revokes_the_whole_family(self, run_async, api_client, seed_catalog):
+        async def scenario():
+            await seed_catalog(password=LOGIN["password"])
+            async with api_client() as client:
+                stolen = (await _login(client))["refresh_token"]
+                other_device = (await _login(client))["refresh_token"]
+                rotated = (await _refresh(client, stolen)).json()["refresh_token"]
+                replay = await _refresh(client, stolen)
+                after_reuse = await _refresh(client, rotated)
+                unaffected = await _refresh(client, other_device)
+            return replay, after_reuse, unaffected
+
+        replay, after_reuse, unaffected = run_async(scenario)
+        assert replay.status_code == 401
+        assert after_reuse.status_code == 401
+        assert unaffected.status_code == 200
+
+    def test_revoke_all_sessions(self, run_async, api_client, seed_catalog):
+        async def scenario():
+            await seed_catalog(password=LOGIN["password"])
+            async with api_client() as client:
+                first = (await _login(client))["refresh_token"]
+                second = (await _login(client))["refresh_token"]
+                revoked = await client.post("/api/v2/users/token/revoke",
+                                            json={"refresh_token": first, "all_sessions": True})
+                return revoked, await _refresh(client, second), await _refresh(client, "garbage")
+
+        revoked, second, garbage = run_async(scenario)
+        assert revoked.json() == {"revoked": 2}
+        assert second.status_code == 401
+        assert garbage.status_code == 401
+
+    def test_expired_token_is_rejected(self, run_async, api_client, monkeypatch, seed_catalog):
+        from app.core.config import settings
+
+        async def scenario():
+            await seed_catalog(password=LOGIN["password"])
+            async with api_client() as client:
+                monkeypatch.setattr(settings, "REFRESH_TOKEN_EXPIRE_DAYS", -1)
+                token = (await _login(client))["refresh_token"]
+                return await _refresh(client, token)
+
+        assert run_async(scenario).status_code == 401
+
+    def test_deactivated_user_cannot_refresh(self, run_async, api_client, seed_catalog):
+        from sqlalchemy import update
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import User
+
+        async def scenario():
+            await seed_catalog(password=LOGIN["password"])
+            async with api_client() as client:
+                token = (await _login(client))["refresh_token"]
+                async with AsyncSessionLocal() as db:
+                    await db.execute(update(User).where(User.id == 1).values(is_active=False))
+                    await db.commit()
+                return await _refresh(client, token)
+
+        assert run_async(scenario).status_code == 401
+
+    def test_rotation_keeps_the_login_expiry(self, run_async, api_client, seed_catalog):
+        from datetime import datetime, timedelta
+        from sqlalchemy import select, update
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import RefreshToken
+
+        async def scenario():
+            await seed_catalog(password=LOGIN["password"])
+            async with api_client() as client:
+                token = (await _login(client))["refresh_token"]
+                # The login is nearly a week old: rotating must not extend it
+                login_expiry = datetime.utcnow() + timedelta(minutes=10)
+                async with AsyncSessionLocal() as db:
+                    await db.execute(update(RefreshToken).values(expires_at=login_expiry))
+                    await db.commit()
+                refreshed = await _refresh(client, token)
+            async with AsyncSessionLocal() as db:
+                expiries = (await db.execute(select(RefreshToken.expires_at))).scalars().all()
+            return refreshed, expiries, login_expiry
+
+        refreshed, expiries, login_expiry = run_async(scenario)
+        assert refreshed.status_code == 200
+        assert refreshed.json()["refresh_expires_in"] <= 600
+        assert expiries == [login_expiry, login_expiry]
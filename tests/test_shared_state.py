@@ -0,0 +1,62 @@
+"""
+Shared-memory Counter Tests
+"""
+
+import multiprocessing
+
+
+def _bump(counters, times):
+    for _ in range(times):
+        counters.add("bookings_created")
+
+
+def _set_sample_rate(counters, ppm):
+    counters.set("profiling_sample_ppm", ppm)
+
+
+class TestSharedCounters:
+    """Counters shared by forked workers"""
+
+    def test_increments_from_forked_workers_are_not_lost(self):
+        from app.core.shared_state import COUNTERS, SharedCounters
+
+        counters = SharedCounters(COUNTERS)
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_bump, args=(counters, 2000)) for _ in range(4)]
+        for process in workers:
+            process.start()
+        _bump(counters, 2000)
+        for process in workers:
+            process.join()
+
+        assert counters.get("bookings_created") == 5 * 2000
+        assert counters.snapshot()["catalog_epoch"] == 0
+
+    def test_value_set_in_one_worker_is_seen_by_the_others(self):
+        from app.core.shared_state import COUNTERS, SharedCounters
+
+        counters = SharedCounters(COUNTERS)
+        counters.set("profiling_sample_ppm", 500_000)
+        ctx = multiprocessing.get_context("fork")
+        worker = ctx.Process(target=_set_sample_rate, args=(counters, 2_500))
+        worker.start()
+        worker.join()
+
+        assert counters.get("profiling_sample_ppm") == 2_500
+
+    def test_creating_a_destination_bumps_catalog_epoch(self, run_async, api_client):
+        from app.core.shared_state import shared_counters
+
+        async def scenario():
+            before = shared_counters.get("catalog_epoch")
+            async with api_client() as client:
+                response = await client.post(
+                    "/api/v2/destinations/",
+                    params={"name": "Europa", "code": "eur-01", "base_price_usd": 5e6,
+                            "distance_km": 6.3e8, "travel_duration_hours": 9000}
+                )
+            return response, shared_counters.get("catalog_epoch") - before
+
+        response, bumped = run_async(scenario)
+        assert response.status_code == 200
+        assert bumped == 1
@@ -0,0 +1,80 @@
+"""
+User Bookings Endpoint Tests
+"""
+
+from datetime import datetime
+
+import pytest
+
+
+async def _seed(bookings=5):
+    from app.core.database import AsyncSessionLocal
+    from app.models.models import Booking, BookingStatus, Destination, User
+
+    async with AsyncSessionLocal() as db:
+        db.add(User(id=1, email="traveller@example.com", hashed_password="x"))
+        db.add(User(id=2, email="nobookings@example.com", hashed_password="x"))
+        for d in range(1, 4):
+            db.add(Destination(id=d, name=f"Dest {d}", code=f"D-{d:02d}", base_price_usd=1000.0 * d))
+        for n in range(bookings):
+            db.add(Booking(
+                reference_code=f"SP-UB{n:04d}", user_id=1, destination_id=1 + n % 3,
+                departure_date=datetime(2031, 1, 1 + n), passenger_count=1, total_price=1000.0,
+                status=BookingStatus.CANCELLED if n == 0 else BookingStatus.CONFIRMED
+            ))
+        await db.commit()
+
+
+@pytest.fixture
+def get(run_async, api_client, statement_log):
+    """GET `path` after seeding; returns the response and the statements it ran"""
+    def request(path, seed_bookings=5):
+        async def scenario():
+            await _seed(seed_bookings)
+            async with api_client() as client:
+                with statement_log() as log:
+                    response = await client.get(path)
+            return response, log.statements
+        return run_async(scenario)
+    return request
+
+
+class TestUserBookings:
+    """GET /api/v2/users/{user_id}/bookings"""
+
+    @pytest.mark.parametrize("count", [1, 12])
+    def test_destination_embedded_in_one_query(self, get, count):
+        response, statements = get("/api/v2/users/1/bookings", seed_bookings=count)
+        assert response.status_code == 200
+        bookings = response.json()
+        assert len(bookings) == count
+        assert bookings[0]["destination"]["code"] == "D-01"
+        assert len(statements) == 1
+
+    def test_status_filter(self, get):
+        response, _ = get("/api/v2/users/1/bookings?status=cancelled")
+        assert [b["reference_code"] for b in response.json()] == ["SP-UB0000"]
+
+    def test_empty_and_unknown_user(self, get):
+        empty, _ = get("/api/v2/users/2/bookings")
+        unknown, _ = get("/api/v2/users/99/bookings")
+        assert (empty.status_code, empty.json()) == (200, [])
+        assert unknown.status_code == 404
+
+
+class TestLazyLoadGuard:
+    """The conftest guard itself"""
+
+    @pytest.mark.allow_lazy_loads
+    def test_lazy_load_is_caught(self, run_async, no_lazy_relationship_loads):
+        from app.core.database import AsyncSessionLocal
+        from app.models.models import Booking
+
+        async def scenario():
+            await _seed(1)
+            async with AsyncSessionLocal() as db:
+                await db.run_sync(lambda session: session.get(Booking, 1).destination)
+
+        with pytest.raises(AssertionError, match="Booking.destination"):
+            run_async(scenario)
+        assert no_lazy_relationship_loads == ["Booking.destination"]